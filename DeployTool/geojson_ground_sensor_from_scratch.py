@@ -21,6 +21,8 @@ import random
 import warnings
 warnings.filterwarnings('ignore')
 
+from geometry_utils import area_grid, contains_xy, lattice
+
 plt.rcParams['font.sans-serif'] = ['SimHei']
 plt.rcParams['axes.unicode_minus'] = False
 
@@ -58,16 +60,8 @@ class GeoJSONGroundSensorFromScratchSolver:
         
     def _initialize_grid(self):
         """初始化目标区域的网格点"""
-        minx, miny, maxx, maxy = self.target_area.bounds
-        x_coords = np.arange(minx, maxx + self.grid_resolution, self.grid_resolution)
-        y_coords = np.arange(miny, maxy + self.grid_resolution, self.grid_resolution)
-        
-        self.grid_points = []
-        for x in x_coords:
-            for y in y_coords:
-                point = Point(x, y)
-                if self.target_area.contains(point) or self.target_area.touches(point):
-                    self.grid_points.append((x, y))
+        xs, ys = area_grid(self.target_area, self.grid_resolution)
+        self.grid_points = list(zip(xs, ys))
         
         print(f"网格点总数: {len(self.grid_points)}")
     
@@ -85,20 +79,12 @@ class GeoJSONGroundSensorFromScratchSolver:
     
     def _get_candidate_positions(self) -> List[Tuple[float, float]]:
         """获取候选传感器位置"""
-        minx, miny, maxx, maxy = self.target_area.bounds
-        
         # 生成候选位置（在目标区域内）
-        candidates = []
         step = self.sensor_radius / 2  # 候选位置的间隔
         
-        x_coords = np.arange(minx, maxx + step, step)
-        y_coords = np.arange(miny, maxy + step, step)
-        
-        for x in x_coords:
-            for y in y_coords:
-                point = Point(x, y)
-                if self.target_area.contains(point):
-                    candidates.append((x, y))
+        xs, ys = lattice(self.target_area.bounds, step)
+        mask = contains_xy(self.target_area, xs, ys)
+        candidates = list(zip(xs[mask], ys[mask]))
         
         print(f"候选位置数量: {len(candidates)}")
         return candidates
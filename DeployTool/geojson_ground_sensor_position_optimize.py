@@ -16,11 +16,14 @@ import numpy as np
 import json
 import matplotlib.pyplot as plt
 from shapely.geometry import Polygon, Point, mapping, shape
+from scipy.spatial import cKDTree
 from typing import List, Tuple, Dict, Any
 import random
 import warnings
 warnings.filterwarnings('ignore')
 
+from geometry_utils import KDTREE_RADIUS_SLACK, area_grid, contains_xy, lattice, pack_bits, point_distance, popcount
+
 plt.rcParams['font.sans-serif'] = ['SimHei']
 plt.rcParams['axes.unicode_minus'] = False
 
@@ -52,9 +55,14 @@ class GeoJSONGroundSensorPositionOptimizer:
         self.target_area = shape(target_area_geojson['geometry'])
         self.original_stations = self._parse_sensors_from_geojson(existing_sensors_geojson)
         
-        # 初始化网格点
-        self.grid_points = []
+        # 初始化网格点，(G, 2) 坐标数组
+        self.grid_points = np.empty((0, 2))
         self._initialize_grid()
+        # 网格点KD树，用于查询传感器半径范围内的网格点
+        self.tree = cKDTree(self.grid_points)
+        
+        # 覆盖位集每个 uint64 字存放 64 个网格点
+        self.n_words = (len(self.grid_points) + 63) // 64
         
     def _parse_sensors_from_geojson(self, sensors_geojson: Dict[str, Any]) -> List[Tuple[float, float]]:
         """从GeoJSON中解析传感器位置"""
@@ -75,48 +83,43 @@ class GeoJSONGroundSensorPositionOptimizer:
     
     def _initialize_grid(self):
         """初始化目标区域的网格点"""
-        minx, miny, maxx, maxy = self.target_area.bounds
-        x_coords = np.arange(minx, maxx + self.grid_resolution, self.grid_resolution)
-        y_coords = np.arange(miny, maxy + self.grid_resolution, self.grid_resolution)
-        
-        self.grid_points = []
-        for x in x_coords:
-            for y in y_coords:
-                point = Point(x, y)
-                if self.target_area.contains(point) or self.target_area.touches(point):
-                    self.grid_points.append((x, y))
+        self.grid_points = np.column_stack(area_grid(self.target_area, self.grid_resolution))
         
         print(f"网格点总数: {len(self.grid_points)}")
     
+    def _positions_to_bits(self, positions) -> np.ndarray:
+        """
+        计算各位置覆盖的网格点并打包为 (n, n_words) 的 uint64 位集
+        
+        用位置KD树与网格点KD树做一次双树查询，只比较半径内的点对，再精确筛选
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        if len(positions) == 0 or len(self.grid_points) == 0:
+            return np.zeros((len(positions), self.n_words), dtype=np.uint64)
+        
+        pairs = cKDTree(positions).sparse_distance_matrix(
+            self.tree, self.sensor_radius * (1 + KDTREE_RADIUS_SLACK), output_type='ndarray')
+        rows = pairs['i'].astype(np.intp)
+        cols = pairs['j'].astype(np.intp)
+        within = point_distance(self.grid_points[cols, 0], self.grid_points[cols, 1],
+                                positions[rows, 0], positions[rows, 1]) <= self.sensor_radius
+        return pack_bits(len(positions), self.n_words, rows[within], cols[within])
+    
     def _evaluate_station_layout(self, stations: List[Tuple[float, float]]) -> float:
         """评估传感器布设方案的覆盖率"""
-        covered_points = set()
-        
-        for station_x, station_y in stations:
-            station_point = Point(station_x, station_y)
-            for i, (x, y) in enumerate(self.grid_points):
-                point = Point(x, y)
-                if station_point.distance(point) <= self.sensor_radius:
-                    covered_points.add(i)
+        # 任一传感器覆盖即视为覆盖
+        covered = np.bitwise_or.reduce(self._positions_to_bits(stations), axis=0)
         
-        coverage_ratio = len(covered_points) / len(self.grid_points)
+        coverage_ratio = int(popcount(covered)) / len(self.grid_points)
         return coverage_ratio
     
     def _get_candidate_positions(self) -> List[Tuple[float, float]]:
         """获取候选传感器位置"""
-        minx, miny, maxx, maxy = self.target_area.bounds
-        
-        candidates = []
         step = self.sensor_radius / 3  # 候选位置的间隔
         
-        x_coords = np.arange(minx, maxx + step, step)
-        y_coords = np.arange(miny, maxy + step, step)
-        
-        for x in x_coords:
-            for y in y_coords:
-                point = Point(x, y)
-                if self.target_area.contains(point):
-                    candidates.append((x, y))
+        xs, ys = lattice(self.target_area.bounds, step)
+        mask = contains_xy(self.target_area, xs, ys)
+        candidates = list(zip(xs[mask], ys[mask]))
         
         return candidates
     
@@ -142,6 +145,11 @@ class GeoJSONGroundSensorPositionOptimizer:
         print(f"初始覆盖率: {initial_coverage*100:.2f}%")
         
         candidate_positions = self._get_candidate_positions()
+        candidate_xy = np.asarray(candidate_positions, dtype=np.float64).reshape(-1, 2)
+        # 候选位置与当前传感器的覆盖位集只计算一次，每次试探移动只需对位集做按位或并计数
+        candidate_bits = self._positions_to_bits(candidate_xy)
+        station_bits = self._positions_to_bits(current_stations)
+        total_points = len(self.grid_points)
         best_coverage = initial_coverage
         best_stations = current_stations.copy()
         iterations_without_improvement = 0
@@ -159,21 +167,20 @@ class GeoJSONGroundSensorPositionOptimizer:
                 
                 # 在当前位置附近搜索更好的位置
                 search_radius = self.sensor_radius * 1.5
-                nearby_candidates = [
-                    pos for pos in candidate_positions
-                    if Point(pos).distance(Point(current_pos)) <= search_radius
-                ]
+                nearby = np.flatnonzero(point_distance(candidate_xy[:, 0], candidate_xy[:, 1],
+                                                       current_pos[0], current_pos[1]) <= search_radius)
                 
-                for candidate_pos in nearby_candidates:
-                    # 临时更换位置并评估
-                    test_stations = current_stations.copy()
-                    test_stations[i] = candidate_pos
-                    
-                    test_coverage = self._evaluate_station_layout(test_stations)
+                if len(nearby) > 0:
+                    # 其余传感器的覆盖与各附近候选位置的覆盖合并，一次得到所有试探移动的覆盖率
+                    others = np.bitwise_or.reduce(np.delete(station_bits, i, axis=0), axis=0)
+                    test_coverages = popcount(candidate_bits[nearby] | others) / total_points
                     
-                    if test_coverage > best_local_coverage:
-                        best_local_coverage = test_coverage
-                        best_pos = candidate_pos
+                    # 取第一个覆盖率最高的候选，与逐个比较 "严格更优才替换" 的结果一致
+                    best_idx = int(np.argmax(test_coverages))
+                    if test_coverages[best_idx] > best_local_coverage:
+                        best_local_coverage = float(test_coverages[best_idx])
+                        best_pos = candidate_positions[nearby[best_idx]]
+                        station_bits[i] = candidate_bits[nearby[best_idx]]
                         improved = True
                 
                 # 更新最佳位置
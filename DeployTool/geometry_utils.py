@@ -0,0 +1,100 @@
+"""
+传感器布设模块共用的几何与位集工具
+
+主要内容：
+1. shapely 向量化谓词的版本兼容（shapely < 2.0 回退到 shapely.vectorized）
+2. 与 GEOS 点距离一致的距离计算
+3. 目标区域网格点生成
+4. uint64 覆盖位集的打包与置位计数
+
+作者：GeoSensingAPI
+"""
+
+import numpy as np
+from shapely.geometry import Point
+from typing import Tuple
+
+try:
+    from shapely import contains_xy, intersects_xy, prepare, points
+    from shapely import distance as _geometry_distance
+
+    def distance_xy(geom, x, y):
+        return _geometry_distance(geom, points(x, y))
+except ImportError:  # shapely < 2.0
+    from shapely.vectorized import contains as contains_xy, touches as _touches_xy
+
+    def intersects_xy(geom, x, y):
+        return contains_xy(geom, x, y) | _touches_xy(geom, x, y)
+
+    def prepare(geom):
+        """shapely < 2.0 的向量化谓词在每次调用内部自行预处理几何体"""
+
+    def distance_xy(geom, x, y):
+        return np.array([geom.distance(Point(px, py)) for px, py in zip(x, y)], dtype=np.float64)
+
+# KD树查询半径的相对放大量；查询结果是真实覆盖集合的超集，再按 point_distance 精确筛选
+KDTREE_RADIUS_SLACK = 1e-9
+
+# NumPy >= 2.0 提供硬件 popcount，旧版本使用 16 位查找表
+HAS_BITWISE_COUNT = hasattr(np, 'bitwise_count')
+if not HAS_BITWISE_COUNT:
+    _POPCOUNT16 = np.unpackbits(
+        np.arange(1 << 16, dtype='<u2').view(np.uint8)).reshape(-1, 16).sum(axis=1).astype(np.uint8)
+
+
+def point_distance(x0, y0, x1, y1):
+    """
+    按 sqrt(dx*dx + dy*dy) 计算两组点之间的距离（支持广播）
+
+    与 GEOS 点距离的舍入一致，恰好位于半径边界上的点判定不变；
+    Numba 内核中的距离也按同一公式计算且不启用 fastmath
+    """
+    dx = x0 - x1
+    dy = y0 - y1
+    return np.sqrt(dx * dx + dy * dy)
+
+
+def lattice(bounds: Tuple[float, float, float, float],
+            resolution: float) -> Tuple[np.ndarray, np.ndarray]:
+    """生成覆盖外包矩形 bounds、间距为 resolution 的格点坐标，按 x 优先展平"""
+    minx, miny, maxx, maxy = bounds
+    x_coords = np.arange(minx, maxx + resolution, resolution)
+    y_coords = np.arange(miny, maxy + resolution, resolution)
+    X, Y = np.meshgrid(x_coords, y_coords, indexing='ij')
+    return X.ravel(), Y.ravel()
+
+
+def area_grid(area, resolution: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    生成落在区域内（含边界）的网格点，返回 x、y 坐标数组
+
+    一次向量化调用判断全部格点；结果按 x 优先排列，x 坐标单调不减
+    """
+    xs, ys = lattice(area.bounds, resolution)
+    inside = intersects_xy(area, xs, ys)
+    return xs[inside], ys[inside]
+
+
+def pack_bits(n_rows: int, n_words: int, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """将 (行号, 网格点索引) 对打包为 (n_rows, n_words) 的 uint64 位集，第 i 个网格点对应第 i 位"""
+    bits = np.zeros((n_rows, n_words), dtype=np.uint64)
+    np.bitwise_or.at(bits, (rows, cols >> 6),
+                     np.left_shift(np.uint64(1), (cols & 63).astype(np.uint64)))
+    return bits
+
+
+def popcount(bits: np.ndarray) -> np.ndarray:
+    """统计位集最后一维上置位的数量"""
+    if HAS_BITWISE_COUNT:
+        return np.bitwise_count(bits).sum(axis=-1, dtype=np.int64)
+    return _POPCOUNT16[bits.view(np.uint16)].sum(axis=-1, dtype=np.int64)
+
+
+def union_and_unique(bits: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """返回各行位集的并集，以及每行独占（仅被该行覆盖）的位"""
+    once = np.zeros(bits.shape[1], dtype=np.uint64)
+    twice = np.zeros(bits.shape[1], dtype=np.uint64)
+    for row in bits:
+        twice |= once & row
+        once |= row
+    return once, bits & ~twice
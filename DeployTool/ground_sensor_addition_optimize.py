@@ -20,6 +20,46 @@ from typing import List, Tuple, Dict
 import warnings
 warnings.filterwarnings('ignore')
 
+from geometry_utils import area_grid, point_distance
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# NumPy 路径按块计算，每块 (块大小, n) 的距离临时数组约占该字节数
+NUMPY_BLOCK_BYTES = 1 << 20
+
+# 内核中的距离与 point_distance 的公式相同，不启用 fastmath
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _covered_kernel(grid_x, grid_y, stations, radius):
+        """标记被至少一个传感器覆盖的网格点"""
+        covered = np.zeros(grid_x.shape[0], dtype=np.bool_)
+        for g in prange(grid_x.shape[0]):
+            for s in range(stations.shape[0]):
+                dx = grid_x[g] - stations[s, 0]
+                dy = grid_y[g] - stations[s, 1]
+                if np.sqrt(dx * dx + dy * dy) <= radius:
+                    covered[g] = True
+                    break
+        return covered
+
+    @njit(parallel=True, cache=True)
+    def _gain_kernel(grid_x, grid_y, candidates, radius):
+        """统计每个候选位置覆盖的网格点数量（调用方只传入尚未覆盖的网格点）"""
+        gains = np.zeros(candidates.shape[0], dtype=np.int64)
+        for c in prange(candidates.shape[0]):
+            count = 0
+            for g in range(grid_x.shape[0]):
+                dx = grid_x[g] - candidates[c, 0]
+                dy = grid_y[g] - candidates[c, 1]
+                if np.sqrt(dx * dx + dy * dy) <= radius:
+                    count += 1
+            gains[c] = count
+        return gains
+
 plt.rcParams['font.sans-serif'] = ['SimHei']
 plt.rcParams['axes.unicode_minus'] = False
 
@@ -47,22 +87,15 @@ class GroundSensorAdditionOptimizer:
         # 创建目标区域的多边形
         self.target_area = Polygon(target_area_coords)
         
-        # 初始化网格点
-        self.grid_points = []
+        # 初始化网格点，(G, 2) 坐标数组
+        self.grid_points = np.empty((0, 2))
         self._initialize_grid()
         
     def _initialize_grid(self):
         """初始化目标区域的网格点"""
-        minx, miny, maxx, maxy = self.target_area.bounds
-        
-        x_coords = np.arange(minx, maxx + self.grid_resolution, self.grid_resolution)
-        y_coords = np.arange(miny, maxy + self.grid_resolution, self.grid_resolution)
-        
-        for x in x_coords:
-            for y in y_coords:
-                point = Point(x, y)
-                if self.target_area.contains(point) or self.target_area.touches(point):
-                    self.grid_points.append((x, y))
+        self.grid_points = np.column_stack(area_grid(self.target_area, self.grid_resolution))
+        self.grid_x = np.ascontiguousarray(self.grid_points[:, 0])
+        self.grid_y = np.ascontiguousarray(self.grid_points[:, 1])
         
         print(f"网格初始化完成，共生成 {len(self.grid_points)} 个网格点")
     
@@ -80,15 +113,8 @@ class GroundSensorAdditionOptimizer:
             return 0.0, set()
         
         # 计算被覆盖的网格点
-        covered_points = set()
-        
-        for station_pos in stations:
-            station_point = Point(station_pos)
-            
-            for i, grid_point in enumerate(self.grid_points):
-                grid_point_geom = Point(grid_point)
-                if station_point.distance(grid_point_geom) <= self.sensor_radius:
-                    covered_points.add(i)
+        covered = self._covered_mask(stations)
+        covered_points = set(np.flatnonzero(covered).tolist())
         
         # 计算覆盖率
         total_points = len(self.grid_points)
@@ -96,6 +122,36 @@ class GroundSensorAdditionOptimizer:
         
         return coverage_ratio, covered_points
     
+    def _covered_mask(self, stations) -> np.ndarray:
+        """返回各网格点是否被给定传感器覆盖的布尔数组"""
+        stations = np.asarray(stations, dtype=np.float64).reshape(-1, 2)
+        if NUMBA_AVAILABLE:
+            return _covered_kernel(self.grid_x, self.grid_y, stations, self.sensor_radius)
+        
+        covered = np.zeros(len(self.grid_x), dtype=bool)
+        block = max(256, NUMPY_BLOCK_BYTES // (8 * max(len(stations), 1)))
+        for start in range(0, len(self.grid_x), block):
+            distance = point_distance(self.grid_x[start:start + block, None],
+                                      self.grid_y[start:start + block, None], stations[:, 0], stations[:, 1])
+            covered[start:start + block] = (distance <= self.sensor_radius).any(axis=1)
+        return covered
+    
+    def _coverage_gains(self, candidates, covered: np.ndarray) -> np.ndarray:
+        """计算各候选位置新增覆盖的网格点数量，covered 为当前已覆盖网格点的布尔数组"""
+        candidates = np.asarray(candidates, dtype=np.float64).reshape(-1, 2)
+        grid_x = self.grid_x[~covered]
+        grid_y = self.grid_y[~covered]
+        if NUMBA_AVAILABLE:
+            return _gain_kernel(grid_x, grid_y, candidates, self.sensor_radius)
+        
+        gains = np.zeros(len(candidates), dtype=np.int64)
+        block = max(1, NUMPY_BLOCK_BYTES // (8 * max(len(grid_x), 1)))
+        for start in range(0, len(candidates), block):
+            distance = point_distance(grid_x, grid_y, candidates[start:start + block, 0, None],
+                                      candidates[start:start + block, 1, None])
+            gains[start:start + block] = np.count_nonzero(distance <= self.sensor_radius, axis=1)
+        return gains
+    
     def _identify_coverage_gaps(self, existing_stations: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
         """
         识别覆盖缺口区域
@@ -106,12 +162,9 @@ class GroundSensorAdditionOptimizer:
         返回:
             未覆盖区域的网格点列表
         """
-        _, covered_points = self._evaluate_station_layout(existing_stations)
+        covered = self._covered_mask(existing_stations)
         
-        uncovered_points = []
-        for i, point in enumerate(self.grid_points):
-            if i not in covered_points:
-                uncovered_points.append(point)
+        uncovered_points = [tuple(point) for point in self.grid_points[~covered]]
         
         return uncovered_points
     
@@ -168,15 +221,10 @@ class GroundSensorAdditionOptimizer:
         返回:
             新增覆盖的网格点数量
         """
-        # 计算当前覆盖情况
-        _, current_covered = self._evaluate_station_layout(current_stations)
-        
-        # 计算增加新传感器后的覆盖情况
-        new_stations = current_stations + [candidate_pos]
-        _, new_covered = self._evaluate_station_layout(new_stations)
+        covered = self._covered_mask(current_stations)
         
         # 返回新增覆盖的点数
-        return len(new_covered - current_covered)
+        return int(self._coverage_gains([candidate_pos], covered)[0])
     
     def optimize_with_additions(self, existing_stations: List[Tuple[float, float]], 
                               target_coverage_ratio: float,
@@ -235,14 +283,15 @@ class GroundSensorAdditionOptimizer:
                 break
             
             # 选择最佳候选位置（贪心策略：选择覆盖增益最大的位置）
+            # 一次计算全部候选的覆盖增益，增益相同时取靠前的候选
             best_position = None
             best_gain = 0
             
-            for candidate_pos in candidates:
-                gain = self._calculate_coverage_gain(candidate_pos, current_stations)
-                if gain > best_gain:
-                    best_gain = gain
-                    best_position = candidate_pos
+            gains = self._coverage_gains(candidates, self._covered_mask(current_stations))
+            best_idx = int(np.argmax(gains))
+            if gains[best_idx] > best_gain:
+                best_gain = int(gains[best_idx])
+                best_position = candidates[best_idx]
             
             if best_position is None or best_gain == 0:
                 print(f"无法找到有效的新增位置，停止增补")
@@ -17,10 +17,13 @@ import numpy as np
 import matplotlib.pyplot as plt
 from shapely.geometry import Polygon, Point
 from shapely.ops import unary_union
+from scipy.spatial import cKDTree
 from typing import List, Tuple, Dict
 import warnings
 warnings.filterwarnings('ignore')
 
+from geometry_utils import KDTREE_RADIUS_SLACK, area_grid, contains_xy, distance_xy, lattice, point_distance
+
 plt.rcParams['font.sans-serif'] = ['SimHei']
 plt.rcParams['axes.unicode_minus'] = False
 
@@ -60,22 +63,18 @@ class GroundSensorFromScratchSolver:
         # 初始化网格
         self._initialize_grid()
         
+        # 网格点KD树，半径查询只返回观测站附近的网格点
+        self.tree = cKDTree(self.grid_xy)
+        self.covered_mask = np.zeros(len(self.grid_points), dtype=bool)
+        
     def _initialize_grid(self):
         """初始化目标区域的网格点"""
-        # 获取区域边界
-        minx, miny, maxx, maxy = self.target_area.bounds
-        
-        # 生成网格点
-        x_coords = np.arange(minx, maxx + self.grid_resolution, self.grid_resolution)
-        y_coords = np.arange(miny, maxy + self.grid_resolution, self.grid_resolution)
-        
-        for x in x_coords:
-            for y in y_coords:
-                point = Point(x, y)
-                if self.target_area.contains(point) or self.target_area.touches(point):
-                    self.grid_points.append((x, y))
-                    # 每个网格点的权重（可以根据实际需求调整）
-                    self.grid_weights.append(1.0)
+        # 生成区域内的网格点
+        xs, ys = area_grid(self.target_area, self.grid_resolution)
+        self.grid_xy = np.column_stack([xs, ys])
+        self.grid_points = list(zip(xs, ys))
+        # 每个网格点的权重（可以根据实际需求调整）
+        self.grid_weights = [1.0] * len(self.grid_points)
         
         print(f"网格初始化完成，共生成 {len(self.grid_points)} 个网格点")
         
@@ -89,16 +88,32 @@ class GroundSensorFromScratchSolver:
         返回:
             被覆盖的网格点索引集合
         """
-        covered_indices = set()
-        station_point = Point(station_pos)
-        
-        for i, grid_point in enumerate(self.grid_points):
-            if i not in self.covered_points:  # 只考虑未被覆盖的点
-                grid_point_geom = Point(grid_point)
-                if station_point.distance(grid_point_geom) <= self.sensor_radius:
-                    covered_indices.add(i)
-                    
-        return covered_indices
+        idx = np.asarray(self.tree.query_ball_point(
+            station_pos, self.sensor_radius * (1 + KDTREE_RADIUS_SLACK)), dtype=np.intp)
+        
+        # 精确筛选半径内的点，只考虑未被覆盖的点
+        distance = point_distance(self.grid_xy[idx, 0], self.grid_xy[idx, 1], station_pos[0], station_pos[1])
+        idx = idx[(distance <= self.sensor_radius) & ~self.covered_mask[idx]]
+        
+        return set(idx.tolist())
+    
+    def _candidate_pairs(self, candidate_positions) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        一次求出所有候选位置覆盖的 (候选序号, 网格点索引) 对
+        
+        候选位置KD树与网格点KD树做双树查询，只比较半径内的点对，再精确筛选
+        """
+        positions = np.asarray(candidate_positions, dtype=np.float64).reshape(-1, 2)
+        if len(positions) == 0 or len(self.grid_xy) == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        
+        pairs = cKDTree(positions).sparse_distance_matrix(
+            self.tree, self.sensor_radius * (1 + KDTREE_RADIUS_SLACK), output_type='ndarray')
+        rows = pairs['i'].astype(np.intp)
+        cols = pairs['j'].astype(np.intp)
+        within = point_distance(self.grid_xy[cols, 0], self.grid_xy[cols, 1],
+                                positions[rows, 0], positions[rows, 1]) <= self.sensor_radius
+        return rows[within], cols[within]
     
     def _get_candidate_positions(self) -> List[Tuple[float, float]]:
         """
@@ -107,21 +122,14 @@ class GroundSensorFromScratchSolver:
         这里使用网格点作为候选位置，实际应用中可以使用更复杂的策略
         """
         # 可以使用网格点作为候选位置
-        candidates = []
-        minx, miny, maxx, maxy = self.target_area.bounds
-        
         # 生成候选位置网格（可以比目标区域网格更稀疏）
         candidate_resolution = self.grid_resolution * 2  # 候选位置网格更稀疏
-        x_coords = np.arange(minx, maxx + candidate_resolution, candidate_resolution)
-        y_coords = np.arange(miny, maxy + candidate_resolution, candidate_resolution)
-        
-        for x in x_coords:
-            for y in y_coords:
-                point = Point(x, y)
-                # 候选位置可以在区域内或边界附近
-                if (self.target_area.contains(point) or 
-                    self.target_area.distance(point) <= self.sensor_radius):
-                    candidates.append((x, y))
+        
+        # 候选位置可以在区域内或边界附近
+        xs, ys = lattice(self.target_area.bounds, candidate_resolution)
+        mask = contains_xy(self.target_area, xs, ys)
+        mask[~mask] = distance_xy(self.target_area, xs[~mask], ys[~mask]) <= self.sensor_radius
+        candidates = list(zip(xs[mask], ys[mask]))
                     
         return candidates
     
@@ -144,8 +152,12 @@ class GroundSensorFromScratchSolver:
         candidate_positions = self._get_candidate_positions()
         print(f"候选观测站位置数: {len(candidate_positions)}")
         
+        # 候选位置的覆盖点对只查询一次，之后每轮按未覆盖点计数
+        pair_rows, pair_cols = self._candidate_pairs(candidate_positions)
+        
         self.station_locations = []
         self.covered_points = set()
+        self.covered_mask = np.zeros(len(self.grid_points), dtype=bool)
         iteration = 0
         
         while len(self.covered_points) < required_coverage:
@@ -154,15 +166,15 @@ class GroundSensorFromScratchSolver:
             best_new_coverage = 0
             best_covered_set = set()
             
-            # 评估每个候选位置
-            for pos in candidate_positions:
-                new_coverage = self._calculate_coverage_for_position(pos)
-                new_coverage_count = len(new_coverage)
-                
-                if new_coverage_count > best_new_coverage:
-                    best_new_coverage = new_coverage_count
-                    best_position = pos
-                    best_covered_set = new_coverage
+            # 评估每个候选位置：统计各候选覆盖的未覆盖点数，取第一个增益最大的候选
+            fresh = ~self.covered_mask[pair_cols]
+            gains = np.bincount(pair_rows[fresh], minlength=len(candidate_positions))
+            if len(gains) > 0:
+                best_idx = int(np.argmax(gains))
+                if gains[best_idx] > best_new_coverage:
+                    best_new_coverage = int(gains[best_idx])
+                    best_position = candidate_positions[best_idx]
+                    best_covered_set = set(pair_cols[fresh & (pair_rows == best_idx)].tolist())
             
             if best_position is None or best_new_coverage == 0:
                 print("警告: 无法找到更多有效的观测站位置")
@@ -171,6 +183,7 @@ class GroundSensorFromScratchSolver:
             # 添加最佳位置
             self.station_locations.append(best_position)
             self.covered_points.update(best_covered_set)
+            self.covered_mask[list(best_covered_set)] = True
             
             current_coverage_ratio = len(self.covered_points) / total_points
             print(f"第 {iteration} 个观测站: {best_position}, "
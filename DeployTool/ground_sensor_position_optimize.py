@@ -15,12 +15,53 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import PatchCollection
+from matplotlib.colors import to_rgba
+from matplotlib.patches import Circle
 from shapely.geometry import Polygon, Point
+from shapely.prepared import prep
+from scipy.spatial import cKDTree
 from typing import List, Tuple, Dict
+import os
 import random
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 warnings.filterwarnings('ignore')
 
+from geometry_utils import (KDTREE_RADIUS_SLACK, area_grid, distance_xy, intersects_xy, lattice, pack_bits,
+                            point_distance, popcount, union_and_unique)
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# 传感器数 × 网格点数超过该值时使用 Numba 内核，避免生成 (S, G) 临时数组
+NUMBA_MIN_WORK = 1 << 16
+
+# 候选位集矩阵的 uint64 字数超过该值时才使用线程池并行评估
+PARALLEL_MIN_WORDS = 1 << 20
+
+# NumPy 路径按网格分块计算，每块 (S, 块大小) 的距离临时数组约占该字节数，可驻留在缓存中
+NUMPY_BLOCK_BYTES = 1 << 15
+
+if NUMBA_AVAILABLE:
+    # 距离与 point_distance 的公式相同，不启用 fastmath
+    @njit(parallel=True, cache=True)
+    def _coverage_kernel(grid_x, grid_y, stations, radius):
+        """统计被至少一个传感器覆盖的网格点数量"""
+        count = 0
+        for g in prange(grid_x.shape[0]):
+            for s in range(stations.shape[0]):
+                dx = grid_x[g] - stations[s, 0]
+                dy = grid_y[g] - stations[s, 1]
+                if np.sqrt(dx * dx + dy * dy) <= radius:
+                    count += 1
+                    break
+        return count
+
 plt.rcParams['font.sans-serif'] = ['SimHei']
 plt.rcParams['axes.unicode_minus'] = False
 
@@ -48,24 +89,33 @@ class GroundSensorPositionOptimizer:
         # 创建目标区域的多边形
         self.target_area = Polygon(target_area_coords)
         
-        # 初始化网格点
-        self.grid_points = []
+        # 传感器可布设范围：距目标区域不超过观测半径，预处理后用于逐点判断
+        self.feasible_area = self.target_area.buffer(sensor_radius)
+        self._prep_feasible_area = prep(self.feasible_area)
+        
+        # 初始化网格点，坐标按 x、y 分别存放为连续的 float64 数组
+        self.grid_x = np.empty(0)
+        self.grid_y = np.empty(0)
         self._initialize_grid()
         
-    def _initialize_grid(self):
-        """初始化目标区域的网格点"""
-        minx, miny, maxx, maxy = self.target_area.bounds
+        # 网格点KD树，半径查询只返回传感器附近的网格点
+        self.tree = cKDTree(np.column_stack((self.grid_x, self.grid_y)))
         
-        x_coords = np.arange(minx, maxx + self.grid_resolution, self.grid_resolution)
-        y_coords = np.arange(miny, maxy + self.grid_resolution, self.grid_resolution)
+        # 覆盖位集每个 uint64 字存放 64 个网格点
+        self.n_words = (len(self.grid_x) + 63) // 64
         
-        for x in x_coords:
-            for y in y_coords:
-                point = Point(x, y)
-                if self.target_area.contains(point) or self.target_area.touches(point):
-                    self.grid_points.append((x, y))
+        # 预先触发 Numba 编译，避免首次评估时的编译延迟
+        if NUMBA_AVAILABLE:
+            _coverage_kernel(self.grid_x[:1], self.grid_y[:1], np.zeros((1, 2)), float(self.sensor_radius))
         
-        print(f"网格初始化完成，共生成 {len(self.grid_points)} 个网格点")
+    def _initialize_grid(self):
+        """初始化目标区域的网格点"""
+        # 坐标保持 float64：转为 float32 会移动格点（如 4.2 变为 4.19999981），改变半径边界上的判定
+        xs, ys = area_grid(self.target_area, self.grid_resolution)
+        self.grid_x = np.ascontiguousarray(xs)
+        self.grid_y = np.ascontiguousarray(ys)
+        
+        print(f"网格初始化完成，共生成 {len(self.grid_x)} 个网格点")
     
     def _evaluate_station_layout(self, stations: List[Tuple[float, float]]) -> float:
         """
@@ -77,47 +127,81 @@ class GroundSensorPositionOptimizer:
         返回:
             覆盖率 (0-1之间)
         """
-        if not stations:
+        total_points = len(self.grid_x)
+        if not stations or total_points == 0:
             return 0.0
         
-        # 计算被覆盖的网格点
-        covered_points = set()
+        st = np.ascontiguousarray(stations, dtype=np.float64)
+        if NUMBA_AVAILABLE and len(st) * total_points > NUMBA_MIN_WORK:
+            return _coverage_kernel(self.grid_x, self.grid_y, st, float(self.sensor_radius)) / total_points
         
-        for station_pos in stations:
-            station_point = Point(station_pos)
-            
-            for i, grid_point in enumerate(self.grid_points):
-                grid_point_geom = Point(grid_point)
-                if station_point.distance(grid_point_geom) <= self.sensor_radius:
-                    covered_points.add(i)
+        # 分块广播计算传感器到网格点的距离 (S, 块大小)
+        block = max(256, NUMPY_BLOCK_BYTES // (st.itemsize * len(st)))
+        covered = 0
+        for start in range(0, total_points, block):
+            distance = point_distance(self.grid_x[start:start + block], self.grid_y[start:start + block],
+                                      st[:, 0, None], st[:, 1, None])
+            covered += int(np.count_nonzero((distance <= self.sensor_radius).any(axis=0)))
         
         # 计算覆盖率
-        total_points = len(self.grid_points)
-        coverage_ratio = len(covered_points) / total_points if total_points > 0 else 0.0
+        coverage_ratio = covered / total_points
         
         return coverage_ratio
     
-    def _get_candidate_positions(self) -> List[Tuple[float, float]]:
-        """生成候选传感器位置"""
-        candidates = []
-        minx, miny, maxx, maxy = self.target_area.bounds
-        
+    def _station_indices(self, station_pos: Tuple[float, float]) -> np.ndarray:
+        """查询单个传感器覆盖的网格点索引，KD树查询后精确筛选"""
+        idx = np.asarray(self.tree.query_ball_point(
+            station_pos, self.sensor_radius * (1 + KDTREE_RADIUS_SLACK)), dtype=np.intp)
+        distance = point_distance(self.grid_x[idx], self.grid_y[idx], station_pos[0], station_pos[1])
+        return idx[distance <= self.sensor_radius]
+    
+    def _positions_to_bits(self, positions) -> np.ndarray:
+        """批量查询各位置覆盖的网格点并打包为 (n, n_words) 的 uint64 位集"""
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        if len(positions) == 0 or len(self.grid_x) == 0:
+            return np.zeros((len(positions), self.n_words), dtype=np.uint64)
+        
+        # 两棵KD树之间一次性求出所有可能在半径内的 (位置, 网格点) 对，再精确筛选
+        pairs = cKDTree(positions).sparse_distance_matrix(
+            self.tree, self.sensor_radius * (1 + KDTREE_RADIUS_SLACK), output_type='ndarray')
+        rows = pairs['i'].astype(np.intp)
+        cols = pairs['j'].astype(np.intp)
+        within = point_distance(self.grid_x[cols], self.grid_y[cols],
+                                positions[rows, 0], positions[rows, 1]) <= self.sensor_radius
+        return pack_bits(len(positions), self.n_words, rows[within], cols[within])
+    
+    def _score_candidates(self, others_bits: np.ndarray, eval_bits: np.ndarray,
+                          executor: ThreadPoolExecutor = None, n_jobs: int = 1) -> np.ndarray:
+        """计算将传感器移动到各候选位置后的覆盖点数，提供线程池时按候选分块并行"""
+        if executor is None or len(eval_bits) < 2 * n_jobs:
+            return popcount(others_bits | eval_bits)
+        
+        bounds = np.linspace(0, len(eval_bits), n_jobs + 1).astype(int)
+        chunks = executor.map(lambda b: popcount(others_bits | eval_bits[b[0]:b[1]]),
+                              zip(bounds[:-1], bounds[1:]))
+        return np.concatenate(list(chunks))
+    
+    def _get_candidate_positions(self) -> np.ndarray:
+        """生成候选传感器位置，返回 (C, 2) 坐标数组"""
         candidate_resolution = self.grid_resolution * 2
-        x_coords = np.arange(minx, maxx + candidate_resolution, candidate_resolution)
-        y_coords = np.arange(miny, maxy + candidate_resolution, candidate_resolution)
-        
-        for x in x_coords:
-            for y in y_coords:
-                point = Point(x, y)
-                if (self.target_area.contains(point) or 
-                    self.target_area.distance(point) <= self.sensor_radius):
-                    candidates.append((x, y))
-                    
-        return candidates
+        
+        # 区域向外扩展一个观测半径，距区域不超过半径的点都可作为候选。缓冲多边形内接于
+        # 真实的半径范围，其中的点必然满足；略放大的缓冲区与其之间的窄带内的点再按到区域的精确距离判断
+        xs, ys = lattice(self.target_area.bounds, candidate_resolution)
+        mask = intersects_xy(self.feasible_area, xs, ys)
+        band = np.flatnonzero(~mask & intersects_xy(
+            self.target_area.buffer(self.sensor_radius * (1 + 1e-2)), xs, ys))
+        mask[band] = distance_xy(self.target_area, xs[band], ys[band]) <= self.sensor_radius
+        
+        return np.column_stack([xs[mask], ys[mask]])
     
     def optimize_positions(self, existing_stations: List[Tuple[float, float]], 
                          target_coverage_ratio: float = None,
-                         max_iterations: int = 100) -> Tuple[List[Tuple[float, float]], float, Dict]:
+                         max_iterations: int = 100,
+                         method: str = 'local_search',
+                         random_seed: int = None,
+                         n_jobs: int = None,
+                         verbose: int = 1) -> Tuple[List[Tuple[float, float]], float, Dict]:
         """
         优化已有传感器布设方案（不增加传感器数量）
         
@@ -125,25 +209,74 @@ class GroundSensorPositionOptimizer:
             existing_stations: 现有传感器位置列表 [(x1,y1), (x2,y2), ...]
             target_coverage_ratio: 目标覆盖率，如果为None则最大化覆盖率
             max_iterations: 最大优化迭代次数
+            method: 优化方法，'local_search' 遍历候选位置的局部搜索，
+                    'annealing' 基于邻域扰动的模拟退火
+            random_seed: 模拟退火的随机种子
+            n_jobs: 局部搜索评估候选位置的线程数，默认使用全部 CPU 核心
+            verbose: 输出详细程度，0 不输出，1 每轮迭代输出一行摘要，
+                     2 额外输出每次传感器移动的详情
             
         返回:
             优化后的传感器位置, 实际覆盖率, 优化统计信息
         """
         if not existing_stations:
             raise ValueError("传感器位置列表不能为空")
+        if method not in ('local_search', 'annealing'):
+            raise ValueError(f"不支持的优化方法: {method}")
         
-        print(f"开始优化现有传感器位置...")
-        print(f"传感器数量: {len(existing_stations)} (固定不变)")
-        print(f"观测半径: {self.sensor_radius}")
-        if target_coverage_ratio:
-            print(f"目标覆盖率: {target_coverage_ratio*100:.1f}%")
+        if verbose:
+            print(f"开始优化现有传感器位置...")
+            print(f"传感器数量: {len(existing_stations)} (固定不变)")
+            print(f"观测半径: {self.sensor_radius}")
+            if target_coverage_ratio:
+                print(f"目标覆盖率: {target_coverage_ratio*100:.1f}%")
         
         # 评估初始方案
         initial_coverage = self._evaluate_station_layout(existing_stations)
-        print(f"初始方案覆盖率: {initial_coverage*100:.2f}%")
+        if verbose:
+            print(f"初始方案覆盖率: {initial_coverage*100:.2f}%")
+        
+        if method == 'local_search':
+            best_stations, best_coverage, optimization_history = self._local_search_positions(
+                existing_stations, initial_coverage, target_coverage_ratio, max_iterations,
+                n_jobs, verbose)
+        else:
+            best_stations, best_coverage, optimization_history = self._anneal_positions(
+                existing_stations, target_coverage_ratio, max_iterations, random_seed, verbose)
         
+        # 准备优化统计信息
+        optimization_stats = {
+            '初始覆盖率': f"{initial_coverage*100:.2f}%",
+            '优化后覆盖率': f"{best_coverage*100:.2f}%",
+            '覆盖率提升': f"{(best_coverage-initial_coverage)*100:.2f}%",
+            '传感器数量': len(existing_stations),
+            '目标覆盖率': f"{target_coverage_ratio*100:.1f}%" if target_coverage_ratio else "最大化覆盖率",
+            '是否达到目标': "是" if (not target_coverage_ratio or best_coverage >= target_coverage_ratio) else "否",
+            '优化迭代次数': len(optimization_history['coverage']),
+            '优化历史': optimization_history
+        }
+        
+        if verbose:
+            print(f"\n位置优化完成!")
+            print(f"初始覆盖率: {initial_coverage*100:.2f}%")
+            print(f"优化后覆盖率: {best_coverage*100:.2f}%")
+            print(f"覆盖率提升: {(best_coverage-initial_coverage)*100:.2f}%")
+        
+        return best_stations, best_coverage, optimization_stats
+    
+    def _local_search_positions(self, existing_stations: List[Tuple[float, float]],
+                                initial_coverage: float, target_coverage_ratio: float,
+                                max_iterations: int, n_jobs: int = None, verbose: int = 1
+                                ) -> Tuple[List[Tuple[float, float]], float, Dict[str, np.ndarray]]:
+        """
+        局部搜索：每轮依次将每个传感器移动到使覆盖率最高的候选位置
+        
+        返回:
+            最佳传感器位置, 最佳覆盖率, 优化历史
+            （'positions': (迭代次数, 传感器数, 2) 数组, 'coverage': (迭代次数,) 数组）
+        """
         # 初始化优化
-        current_stations = existing_stations.copy()
+        current_stations = list(existing_stations)
         current_coverage = initial_coverage
         best_stations = current_stations.copy()
         best_coverage = current_coverage
@@ -151,94 +284,232 @@ class GroundSensorPositionOptimizer:
         # 获取候选位置
         candidate_positions = self._get_candidate_positions()
         
-        optimization_history = []
+        candidate_bits = self._positions_to_bits(candidate_positions)
+        candidate_tree = cKDTree(candidate_positions)
+        
+        # 每个传感器的覆盖位集，移动传感器时只需替换对应的一行
+        total_points = len(self.grid_x)
+        station_bits = self._positions_to_bits(current_stations)
+        # 总覆盖位集及每个传感器独占的位，去掉独占位即为其余传感器的覆盖
+        total_bits, unique_bits = union_and_unique(station_bits)
+        current_covered = int(popcount(total_bits))
+        
+        # 只有覆盖到当前未覆盖网格点的候选位置才可能提升覆盖率
+        valid_bits = pack_bits(1, self.n_words, np.zeros(total_points, dtype=np.intp),
+                               np.arange(total_points))[0]
+        uncovered_bits = ~total_bits & valid_bits
+        useful = (candidate_bits & uncovered_bits).any(axis=1)
+        
+        # 优化历史预分配为数组，每轮迭代写入一行
+        history_positions = np.empty((max_iterations, len(current_stations), 2), dtype=np.float64)
+        history_coverage = np.empty(max_iterations, dtype=np.float64)
+        n_iterations = 0
         no_improvement_count = 0
         
-        for iteration in range(max_iterations):
-            improved = False
+        # 候选位置较多时分块交给线程池评估，NumPy 位运算期间会释放 GIL
+        n_jobs = n_jobs or os.cpu_count() or 1
+        parallel = n_jobs > 1 and candidate_bits.size >= PARALLEL_MIN_WORDS
+        
+        with ThreadPoolExecutor(max_workers=n_jobs) if parallel else nullcontext() as executor:
+            for iteration in range(max_iterations):
+                improved = False
+                # 本轮的移动记录，迭代结束时统一输出，避免在内层循环中频繁打印
+                move_log = []
             
-            # 尝试移动每个传感器到更好的位置
-            for station_idx in range(len(current_stations)):
-                best_new_position = None
-                best_new_coverage = current_coverage
+                # 尝试移动每个传感器到更好的位置
+                for station_idx in range(len(current_stations)):
+                    # 保存当前传感器位置
+                    original_position = current_stations[station_idx]
                 
-                # 保存当前传感器位置
-                original_position = current_stations[station_idx]
+                    # 除当前传感器外其余传感器覆盖的网格点
+                    others_bits = total_bits ^ unique_bits[station_idx]
                 
-                # 尝试将当前传感器移动到每个候选位置
-                for new_pos in candidate_positions:
-                    # 临时移动传感器
-                    current_stations[station_idx] = new_pos
+                    # 有效候选占多数时直接评估全部候选，省去取子集的拷贝（结果相同）
+                    useful_candidates = np.flatnonzero(useful)
+                    if 2 * len(useful_candidates) > len(candidate_positions):
+                        useful_candidates = np.arange(len(candidate_positions))
+                        eval_bits = candidate_bits
+                    else:
+                        eval_bits = candidate_bits[useful_candidates]
+                
+                    # 一次性评估将当前传感器移动到每个有效候选位置后的覆盖点数
+                    new_covered = self._score_candidates(others_bits, eval_bits, executor, n_jobs)
+                    best = int(np.argmax(new_covered)) if len(new_covered) > 0 else -1
+                
+                    # 如果找到改进
+                    if best >= 0 and new_covered[best] > current_covered:
+                        best_idx = useful_candidates[best]
+                        best_new_position = tuple(candidate_positions[best_idx].tolist())
+                        current_stations[station_idx] = best_new_position
+                        station_bits[station_idx] = candidate_bits[best_idx]
+                        current_covered = int(new_covered[best])
+                        current_coverage = current_covered / total_points
+                        improved = True
                     
-                    # 评估新布局的覆盖率
-                    new_coverage = self._evaluate_station_layout(current_stations)
+                        # 接受移动后刷新并集与独占位
+                        total_bits, unique_bits = union_and_unique(station_bits)
                     
-                    # 如果找到更好的位置
-                    if new_coverage > best_new_coverage:
-                        best_new_coverage = new_coverage
-                        best_new_position = new_pos
-                
-                # 如果找到改进
-                if best_new_position is not None:
-                    current_stations[station_idx] = best_new_position
-                    current_coverage = best_new_coverage
-                    improved = True
+                        # 覆盖状态只在新旧位置附近变化，只需重新筛选两倍半径内的候选位置
+                        uncovered_bits = ~total_bits & valid_bits
+                        affected = candidate_tree.query_ball_point(
+                            [original_position, best_new_position], 2 * self.sensor_radius * (1 + 1e-9))
+                        affected = np.unique(np.concatenate(
+                            [np.asarray(a, dtype=np.intp) for a in affected]))
+                        useful[affected] = (candidate_bits[affected] & uncovered_bits).any(axis=1)
                     
-                    print(f"迭代 {iteration+1}: 移动传感器 {station_idx+1} "
-                          f"从 {original_position} 到 {best_new_position}, "
+                        move_log.append((station_idx, original_position, best_new_position,
+                                         current_coverage))
+            
+                if verbose >= 2:
+                    for station_idx, old_position, new_position, coverage in move_log:
+                        print(f"迭代 {iteration+1}: 移动传感器 {station_idx+1} "
+                              f"从 {old_position} 到 {new_position}, "
+                              f"覆盖率: {coverage*100:.2f}%")
+                if verbose and move_log:
+                    print(f"迭代 {iteration+1}: 移动了 {len(move_log)} 个传感器, "
                           f"覆盖率: {current_coverage*100:.2f}%")
+            
+                # 记录优化历史
+                history_positions[iteration] = current_stations
+                history_coverage[iteration] = current_coverage
+                n_iterations = iteration + 1
+            
+                # 更新最佳方案
+                if current_coverage > best_coverage:
+                    best_coverage = current_coverage
+                    best_stations = current_stations.copy()
+                    no_improvement_count = 0
                 else:
-                    # 恢复原位置
-                    current_stations[station_idx] = original_position
+                    no_improvement_count += 1
             
-            # 记录优化历史
-            optimization_history.append({
-                'iteration': iteration + 1,
-                'coverage': current_coverage,
-                'stations': current_stations.copy()
-            })
+                # 检查收敛条件
+                if not improved:
+                    if verbose:
+                        print(f"在迭代 {iteration+1} 没有找到改进，优化结束")
+                    break
             
-            # 更新最佳方案
-            if current_coverage > best_coverage:
-                best_coverage = current_coverage
-                best_stations = current_stations.copy()
-                no_improvement_count = 0
-            else:
-                no_improvement_count += 1
+                # 如果连续多次没有改进，提前结束
+                if no_improvement_count >= 10:
+                    if verbose:
+                        print(f"连续 {no_improvement_count} 次迭代无改进，优化结束")
+                    break
             
-            # 检查收敛条件
-            if not improved:
-                print(f"在迭代 {iteration+1} 没有找到改进，优化结束")
-                break
+                # 如果已达到目标覆盖率
+                if target_coverage_ratio and current_coverage >= target_coverage_ratio:
+                    if verbose:
+                        print(f"已达到目标覆盖率 {target_coverage_ratio*100:.1f}%，优化结束")
+                    break
+        
+        optimization_history = {
+            'positions': history_positions[:n_iterations],
+            'coverage': history_coverage[:n_iterations]
+        }
+        return best_stations, best_coverage, optimization_history
+    
+    def _anneal_positions(self, existing_stations: List[Tuple[float, float]],
+                          target_coverage_ratio: float, max_iterations: int,
+                          random_seed: int = None, verbose: int = 1
+                          ) -> Tuple[List[Tuple[float, float]], float, Dict[str, np.ndarray]]:
+        """
+        模拟退火：每步随机选择一个传感器做高斯扰动，按 Metropolis 准则接受，
+        每轮迭代后温度与扰动步长几何衰减
+        
+        返回:
+            最佳传感器位置, 最佳覆盖率, 优化历史
+            （'positions': (迭代次数, 传感器数, 2) 数组, 'coverage': (迭代次数,) 数组）
+        """
+        rng = np.random.default_rng(random_seed)
+        minx, miny, maxx, maxy = self.target_area.bounds
+        
+        # 维护每个网格点被覆盖的次数，移动传感器只需更新其新旧覆盖范围
+        current_stations = list(existing_stations)
+        total_points = len(self.grid_x)
+        station_indices = [self._station_indices(pos) for pos in current_stations]
+        cover_count = np.zeros(total_points, dtype=np.int32)
+        for idx in station_indices:
+            cover_count[idx] += 1
+        current_covered = np.count_nonzero(cover_count)
+        
+        best_stations = list(current_stations)
+        best_covered = current_covered
+        
+        # 温度以覆盖率为单位，初始时损失 1% 覆盖率的移动约有 1/e 的接受概率
+        temperature = 0.01
+        sigma = self.sensor_radius
+        steps_per_iteration = 20 * len(current_stations)
+        
+        # 优化历史预分配为数组，每轮迭代写入一行
+        history_positions = np.empty((max_iterations, len(current_stations), 2), dtype=np.float64)
+        history_coverage = np.empty(max_iterations, dtype=np.float64)
+        n_iterations = 0
+        no_improvement_count = 0
+        
+        for iteration in range(max_iterations):
+            improved = False
+            
+            for _ in range(steps_per_iteration):
+                station_idx = int(rng.integers(len(current_stations)))
+                old_x, old_y = current_stations[station_idx]
+                new_pos = (float(np.clip(old_x + rng.normal(0, sigma),
+                                         minx - self.sensor_radius, maxx + self.sensor_radius)),
+                           float(np.clip(old_y + rng.normal(0, sigma),
+                                         miny - self.sensor_radius, maxy + self.sensor_radius)))
+                if not self._prep_feasible_area.intersects(Point(new_pos)):
+                    continue
+                
+                # 先移除当前传感器，再统计新位置新增与旧位置失去的覆盖点
+                old_indices = station_indices[station_idx]
+                new_indices = self._station_indices(new_pos)
+                cover_count[old_indices] -= 1
+                delta = (np.count_nonzero(cover_count[new_indices] == 0) -
+                         np.count_nonzero(cover_count[old_indices] == 0))
+                
+                if delta >= 0 or rng.random() < np.exp(delta / total_points / temperature):
+                    cover_count[new_indices] += 1
+                    station_indices[station_idx] = new_indices
+                    current_stations[station_idx] = new_pos
+                    current_covered += delta
+                    
+                    if current_covered > best_covered:
+                        best_covered = current_covered
+                        best_stations = list(current_stations)
+                        improved = True
+                else:
+                    cover_count[old_indices] += 1
+            
+            temperature *= 0.97
+            sigma *= 0.99
+            
+            best_coverage = best_covered / total_points
+            if verbose:
+                print(f"迭代 {iteration+1}: 温度 {temperature:.5f}, "
+                      f"当前覆盖率: {current_covered / total_points * 100:.2f}%, "
+                      f"最佳覆盖率: {best_coverage*100:.2f}%")
+            
+            # 记录优化历史
+            history_positions[iteration] = current_stations
+            history_coverage[iteration] = current_covered / total_points
+            n_iterations = iteration + 1
+            
+            no_improvement_count = 0 if improved else no_improvement_count + 1
             
             # 如果连续多次没有改进，提前结束
             if no_improvement_count >= 10:
-                print(f"连续 {no_improvement_count} 次迭代无改进，优化结束")
+                if verbose:
+                    print(f"连续 {no_improvement_count} 次迭代无改进，优化结束")
                 break
             
             # 如果已达到目标覆盖率
-            if target_coverage_ratio and current_coverage >= target_coverage_ratio:
-                print(f"已达到目标覆盖率 {target_coverage_ratio*100:.1f}%，优化结束")
+            if target_coverage_ratio and best_coverage >= target_coverage_ratio:
+                if verbose:
+                    print(f"已达到目标覆盖率 {target_coverage_ratio*100:.1f}%，优化结束")
                 break
         
-        # 准备优化统计信息
-        optimization_stats = {
-            '初始覆盖率': f"{initial_coverage*100:.2f}%",
-            '优化后覆盖率': f"{best_coverage*100:.2f}%",
-            '覆盖率提升': f"{(best_coverage-initial_coverage)*100:.2f}%",
-            '传感器数量': len(existing_stations),
-            '目标覆盖率': f"{target_coverage_ratio*100:.1f}%" if target_coverage_ratio else "最大化覆盖率",
-            '是否达到目标': "是" if (not target_coverage_ratio or best_coverage >= target_coverage_ratio) else "否",
-            '优化迭代次数': len(optimization_history),
-            '优化历史': optimization_history
+        optimization_history = {
+            'positions': history_positions[:n_iterations],
+            'coverage': history_coverage[:n_iterations]
         }
-        
-        print(f"\n位置优化完成!")
-        print(f"初始覆盖率: {initial_coverage*100:.2f}%")
-        print(f"优化后覆盖率: {best_coverage*100:.2f}%")
-        print(f"覆盖率提升: {(best_coverage-initial_coverage)*100:.2f}%")
-        
-        return best_stations, best_coverage, optimization_stats
+        return best_stations, best_covered / total_points, optimization_history
     
     def visualize_optimization(self, original_stations: List[Tuple[float, float]], 
                              optimized_stations: List[Tuple[float, float]],
@@ -272,22 +543,23 @@ class GroundSensorPositionOptimizer:
                 'b-', linewidth=2, label='目标区域')
         ax.fill(x_coords, y_coords, alpha=0.2, color='lightblue')
         
-        # 绘制传感器覆盖
-        for i, station in enumerate(stations):
-            circle = plt.Circle(station, self.sensor_radius, 
-                              fill=False, color='green', alpha=0.7, linewidth=1.5)
-            ax.add_patch(circle)
-            
-            circle_fill = plt.Circle(station, self.sensor_radius, 
-                                   fill=True, color='green', alpha=0.2)
-            ax.add_patch(circle_fill)
+        # 绘制传感器覆盖（所有圆合并为一个集合对象绘制）
+        if stations:
+            circles = [Circle(station, self.sensor_radius) for station in stations]
+            ax.add_collection(PatchCollection(circles,
+                                              facecolor=to_rgba('green', 0.2),
+                                              edgecolor=to_rgba('green', 0.7),
+                                              linewidth=1.5))
             
-            # 标注传感器
-            ax.scatter(station[0], station[1], c='green', s=80, 
+            station_x, station_y = zip(*stations)
+            ax.scatter(station_x, station_y, c='green', s=80, 
                       marker='o', edgecolors='black', linewidth=1, zorder=5)
+        
+        # 标注传感器
+        label_bbox = dict(boxstyle='round,pad=0.2', facecolor='green', alpha=0.7)
+        for i, station in enumerate(stations):
             ax.text(station[0], station[1] + self.sensor_radius + 0.3, f'{i+1}', 
-                   fontsize=8, ha='center', va='bottom',
-                   bbox=dict(boxstyle='round,pad=0.2', facecolor='green', alpha=0.7))
+                   fontsize=8, ha='center', va='bottom', bbox=label_bbox)
         
         ax.set_xlabel('X 坐标')
         ax.set_ylabel('Y 坐标')
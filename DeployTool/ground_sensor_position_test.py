@@ -0,0 +1,70 @@
+"""
+地面传感器位置优化覆盖判定的回归测试
+
+布局评估（Numba 内核与 NumPy 路径）、KD树位集与 GEOS 点距离对半径边界上网格点的判定必须一致
+"""
+
+import io
+import contextlib
+import math
+import random
+import numpy as np
+import shapely
+from shapely.geometry import Point
+
+import ground_sensor_position_optimize as gspo
+from geometry_utils import lattice, popcount
+
+SQUARE = [(0, 0), (10, 0), (10, 10), (0, 10)]
+
+
+def _optimizer(radius, resolution, area=SQUARE):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return gspo.GroundSensorPositionOptimizer(area, radius, resolution)
+
+
+def _bits_count(optimizer, stations):
+    return int(popcount(np.bitwise_or.reduce(optimizer._positions_to_bits(stations), axis=0)))
+
+
+def test_layout_evaluation_matches_bitsets(monkeypatch):
+    """随机布局下 _evaluate_station_layout 的覆盖点数与位集置位数一致（两条计算路径）"""
+    optimizer = _optimizer(1.5, 0.05)
+    total_points = len(optimizer.grid_x)
+    candidates = optimizer._get_candidate_positions()
+    rng = np.random.default_rng(0)
+    layouts = [[tuple(p) for p in candidates[rng.choice(len(candidates), size=int(rng.integers(2, 8)))]]
+               for _ in range(75)]
+
+    for numba_available in (gspo.NUMBA_AVAILABLE, False):
+        monkeypatch.setattr(gspo, 'NUMBA_AVAILABLE', numba_available)
+        for stations in layouts:
+            covered = round(optimizer._evaluate_station_layout(stations) * total_points)
+            assert covered == _bits_count(optimizer, stations), stations
+
+
+def test_boundary_points_match_geos_distance():
+    """恰好位于半径上的网格点按 GEOS 点距离判定"""
+    optimizer = _optimizer(1.3, 0.1)
+    grid = shapely.points(optimizer.grid_x, optimizer.grid_y)
+    for stations in ([(3, 4)], [(6, 5)], [(2, 2), (5, 5)]):
+        expected = np.zeros(len(grid), dtype=bool)
+        for station in stations:
+            expected |= shapely.distance(grid, Point(station)) <= optimizer.sensor_radius
+        assert _bits_count(optimizer, stations) == int(expected.sum())
+        assert round(optimizer._evaluate_station_layout(stations) * len(grid)) == int(expected.sum())
+
+
+def test_candidates_keep_points_at_radius_from_vertices():
+    """距区域恰好一个观测半径的格点（含凸顶点附近）保留为候选"""
+    for seed in range(150):
+        rng = random.Random(seed)
+        angles = sorted(rng.uniform(0, 2 * math.pi) for _ in range(rng.randint(3, 7)))
+        area = [(round(5 + rng.uniform(2, 5) * math.cos(a), 1), round(5 + rng.uniform(2, 5) * math.sin(a), 1))
+                for a in angles]
+        optimizer = _optimizer(rng.choice([1.0, 1.5, 2.0]), rng.choice([0.25, 0.5]), area)
+        if not optimizer.target_area.is_valid:
+            continue
+        xs, ys = lattice(optimizer.target_area.bounds, optimizer.grid_resolution * 2)
+        keep = shapely.distance(optimizer.target_area, shapely.points(xs, ys)) <= optimizer.sensor_radius
+        np.testing.assert_array_equal(optimizer._get_candidate_positions(), np.column_stack([xs[keep], ys[keep]]))
@@ -15,16 +15,92 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+from matplotlib.collections import LineCollection, PatchCollection, PolyCollection
+from matplotlib.colors import to_rgba
+from matplotlib.patches import Circle
 from shapely.geometry import Polygon, Point
 from typing import List, Tuple, Dict
 import random
 import math
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import os
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 warnings.filterwarnings('ignore')
 
+from geometry_utils import area_grid, contains_xy, point_distance
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# 传感器数 × 网格点数超过该值时使用 Numba 融合内核计算覆盖掩码
+NUMBA_MIN_WORK = 1 << 16
+
+# NumPy 路径按网格分块广播地面传感器，每块 (传感器数, 块大小) 的临时数组约占该字节数，可驻留在缓存中
+NUMPY_BLOCK_BYTES = 1 << 15
+
+# 候选卫星轨道倾角（度）：0 为南北向，90 为东西向，其余为斜向
+SATELLITE_TRACK_ANGLES = (0, 45, 90, 135)
+
+# 各倾角的轨道单位方向 (cos, sin)，候选生成时不再逐个计算三角函数
+TRACK_DIRECTIONS = np.array([(np.cos(np.radians(angle)), np.sin(np.radians(angle)))
+                             for angle in SATELLITE_TRACK_ANGLES])
+
+# 解析覆盖判断的边界容差（相对坐标量级）：距覆盖边界不超过该容差的网格点
+# 改用 shapely / NumPy 精确判定，保证与按多边形和点距离计算的结果完全一致
+BOUNDARY_RTOL = 1e-9
+
+# 网格点数超过该值时按缺口中心用线程池并行评估候选
+PARALLEL_MIN_POINTS = 1 << 17
+
+# 网格点数不少于该值（约 16 个传感器即会用到融合内核）时才在初始化时预热 Numba 内核；
+# 更小的网格一般用不到内核，省去每个进程约 0.4 s 的内核加载（即使已有磁盘缓存）
+NUMBA_WARMUP_MIN_POINTS = NUMBA_MIN_WORK // 16
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _coverage_state_kernel(xs, ys, ground_xyr, sat_params, tol):
+        """
+        逐网格点融合判断所有传感器的覆盖状态
+        
+        返回每个网格点的状态：0 未覆盖，1 覆盖，2 靠近覆盖边界需精确复核
+        """
+        state = np.zeros(xs.shape[0], dtype=np.uint8)
+        for i in prange(xs.shape[0]):
+            x = xs[i]
+            y = ys[i]
+            s = 0
+            # 地面传感器：圆形覆盖，含边界
+            for k in range(ground_xyr.shape[0]):
+                dx = x - ground_xyr[k, 0]
+                dy = y - ground_xyr[k, 1]
+                margin = ground_xyr[k, 2] - np.sqrt(dx * dx + dy * dy)
+                if margin > tol:
+                    s = 1
+                    break
+                if margin >= -tol:
+                    s = 2
+            # 卫星：投影到轨道方向，沿轨与垂轨都在条带内部即覆盖
+            if s != 1:
+                for k in range(sat_params.shape[0]):
+                    px = x - sat_params[k, 0]
+                    py = y - sat_params[k, 1]
+                    along = px * sat_params[k, 2] + py * sat_params[k, 3]
+                    perp = py * sat_params[k, 2] - px * sat_params[k, 3]
+                    margin = min(sat_params[k, 6] - abs(perp),
+                                 along - sat_params[k, 4], sat_params[k, 5] - along)
+                    if margin > tol:
+                        s = 1
+                        break
+                    if margin >= -tol:
+                        s = 2
+            state[i] = s
+        return state
+
 plt.rcParams['font.sans-serif'] = ['SimHei']
 plt.rcParams['axes.unicode_minus'] = False
 
@@ -38,9 +114,17 @@ class Satellite:
     end_y: float
     swath_width: float
     cost: float = 100.0
+    # 覆盖多边形缓存，传感器参数创建后不再修改
+    _coverage: Polygon = field(default=None, init=False, repr=False, compare=False)
     
     def get_coverage_area(self) -> Polygon:
-        """获取卫星覆盖区域的多边形（条带状）"""
+        """获取卫星覆盖区域的多边形（条带状），首次构造后缓存在实例上"""
+        if self._coverage is None:
+            self._coverage = self._build_coverage_area()
+        return self._coverage
+    
+    def _build_coverage_area(self) -> Polygon:
+        """按轨道起止点和幅宽构造条带多边形"""
         dx = self.end_x - self.start_x
         dy = self.end_y - self.start_y
         length = math.sqrt(dx**2 + dy**2)
@@ -67,6 +151,54 @@ class Satellite:
         ]
         
         return Polygon(vertices)
+    
+    def strip_params(self) -> Tuple[float, float, float, float, float, float, float]:
+        """
+        条带的解析参数：起点 x、y，轨道单位方向 x、y，沿轨范围下限、上限，半幅宽
+        """
+        dx = self.end_x - self.start_x
+        dy = self.end_y - self.start_y
+        length = math.sqrt(dx**2 + dy**2)
+        half_width = self.swath_width / 2
+        
+        if length == 0:
+            # 起止点重合时覆盖区域为以起点为中心的正方形
+            return self.start_x, self.start_y, 1.0, 0.0, -half_width, half_width, half_width
+        return self.start_x, self.start_y, dx / length, dy / length, 0.0, length, half_width
+    
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """条带覆盖区域的外包矩形 (minx, miny, maxx, maxy)"""
+        start_x, start_y, ux, uy, along_min, along_max, half_width = self.strip_params()
+        corner_x = [start_x + a * ux + side * half_width * uy
+                    for a in (along_min, along_max) for side in (-1, 1)]
+        corner_y = [start_y + a * uy - side * half_width * ux
+                    for a in (along_min, along_max) for side in (-1, 1)]
+        return min(corner_x), min(corner_y), max(corner_x), max(corner_y)
+    
+    def mask(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        判断各点是否在卫星条带内部（不含边界）
+        
+        按轨道方向投影解析判断；距条带边界很近的点交给 shapely 按多边形精确判定，
+        与 get_coverage_area().contains 的结果一致
+        """
+        start_x, start_y, ux, uy, along_min, along_max, half_width = self.strip_params()
+        px = xs - start_x
+        py = ys - start_y
+        along = px * ux + py * uy
+        perp = py * ux - px * uy
+        margin = np.minimum(np.minimum(half_width - np.abs(perp), along - along_min), along_max - along)
+        
+        scale = max(1.0, abs(start_x), abs(start_y), along_max, half_width,
+                    np.abs(xs).max(initial=0.0), np.abs(ys).max(initial=0.0))
+        tol = BOUNDARY_RTOL * scale
+        inside = margin > tol
+        
+        # 边界附近通常只有少量点，多边形只用一次，不必预处理
+        near = np.flatnonzero(np.abs(margin) <= tol)
+        if len(near) > 0:
+            inside[near] = contains_xy(self.get_coverage_area(), xs[near], ys[near])
+        return inside
 
 @dataclass
 class GroundSensor:
@@ -76,10 +208,18 @@ class GroundSensor:
     y: float
     radius: float
     cost: float = 10.0
+    # 覆盖多边形缓存，传感器参数创建后不再修改
+    _coverage: Polygon = field(default=None, init=False, repr=False, compare=False)
     
     def get_coverage_area(self) -> Polygon:
-        """获取地面传感器覆盖区域的多边形（圆形）"""
-        return Point(self.x, self.y).buffer(self.radius)
+        """获取地面传感器覆盖区域的多边形（圆形），仅用于可视化，首次构造后缓存在实例上"""
+        if self._coverage is None:
+            self._coverage = Point(self.x, self.y).buffer(self.radius)
+        return self._coverage
+    
+    def mask(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """判断各点是否在传感器覆盖范围内"""
+        return point_distance(xs, ys, self.x, self.y) <= self.radius
 
 @dataclass
 class AdditionCandidate:
@@ -89,6 +229,9 @@ class AdditionCandidate:
     cost: float
     expected_coverage_gain: float
     cost_effectiveness: float  # 覆盖增益/成本
+    # 估算增益时算出的覆盖掩码及其对应的网格点区间，选中后直接并入当前覆盖
+    coverage_slice: slice = field(default=None, repr=False, compare=False)
+    coverage_mask: np.ndarray = field(default=None, repr=False, compare=False)
 
 @dataclass
 class HybridAdditionSolution:
@@ -120,54 +263,115 @@ class HybridSensorAdditionOptimizer:
         """
         self.target_area = target_area
         self.grid_resolution = grid_resolution
-        self.grid_points = self._generate_grid_points()
         
-    def _generate_grid_points(self) -> List[Tuple[float, float]]:
-        """生成覆盖计算的网格点"""
-        minx, miny, maxx, maxy = self.target_area.bounds
+        # 区域外包矩形在网格生成、候选轨道和绘图中反复使用，只取一次
+        self._bounds = target_area.bounds
+        
+        # 网格点坐标按 x、y 分别存放，供向量化覆盖判断使用
+        self.xs, self.ys = self._generate_grid_points()
+        self.grid_points = list(zip(self.xs.tolist(), self.ys.tolist()))
         
-        x_coords = np.arange(minx, maxx + self.grid_resolution, self.grid_resolution)
-        y_coords = np.arange(miny, maxy + self.grid_resolution, self.grid_resolution)
+        # 预先触发 Numba 编译，避免首次评估时的编译延迟；小网格按需再加载
+        if NUMBA_AVAILABLE and len(self.xs) >= NUMBA_WARMUP_MIN_POINTS:
+            _coverage_state_kernel(self.xs[:1], self.ys[:1],
+                                   np.zeros((1, 3)), np.zeros((1, 7)), 0.0)
         
-        grid_points = []
-        for x in x_coords:
-            for y in y_coords:
-                point = Point(x, y)
-                if self.target_area.contains(point) or self.target_area.touches(point):
-                    grid_points.append((x, y))
+    def _generate_grid_points(self) -> Tuple[np.ndarray, np.ndarray]:
+        """生成覆盖计算的网格点，返回 x、y 坐标数组"""
+        # 网格点按 x 优先排列，x 坐标单调不减，可按 x 范围二分截取
+        xs, ys = area_grid(self.target_area, self.grid_resolution)
         
-        return grid_points
+        return np.ascontiguousarray(xs), np.ascontiguousarray(ys)
     
     def evaluate_deployment(self, satellites: List[Satellite], 
-                          ground_sensors: List[GroundSensor]) -> Tuple[float, set]:
+                          ground_sensors: List[GroundSensor]) -> Tuple[float, np.ndarray]:
         """
-        评估当前部署方案的覆盖率和覆盖点集合
+        评估当前部署方案的覆盖率和覆盖掩码
         
         参数:
             satellites: 卫星列表
             ground_sensors: 地面传感器列表
             
         返回:
-            覆盖率, 被覆盖的网格点索引集合
+            覆盖率, 网格点是否被覆盖的布尔数组
         """
-        covered_points = set()
+        covered_mask = self.evaluate_masks(satellites, ground_sensors)
+        return self._coverage_ratio(covered_mask), covered_mask
+    
+    @staticmethod
+    def _coverage_ratio(covered_mask: np.ndarray) -> float:
+        """覆盖掩码对应的覆盖率"""
+        return np.count_nonzero(covered_mask) / len(covered_mask) if len(covered_mask) else 0.0
+    
+    def evaluate_masks(self, satellites: List[Satellite],
+                       ground_sensors: List[GroundSensor]) -> np.ndarray:
+        """
+        计算部署方案的覆盖掩码
         
-        # 计算卫星覆盖
-        for satellite in satellites:
-            satellite_coverage = satellite.get_coverage_area()
-            for i, point in enumerate(self.grid_points):
-                if satellite_coverage.contains(Point(point)):
-                    covered_points.add(i)
+        参数:
+            satellites: 卫星列表
+            ground_sensors: 地面传感器列表
+            
+        返回:
+            网格点是否被覆盖的布尔数组
+        """
+        n_sensors = len(satellites) + len(ground_sensors)
+        if NUMBA_AVAILABLE and n_sensors * len(self.xs) > NUMBA_MIN_WORK:
+            return self._fused_mask(satellites, ground_sensors)
+        return self._exact_mask(satellites, ground_sensors, self.xs, self.ys)
+    
+    def _exact_mask(self, satellites: List[Satellite], ground_sensors: List[GroundSensor],
+                    xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """逐传感器计算给定点的精确覆盖掩码"""
+        covered_mask = np.zeros(len(xs), dtype=bool)
         
-        # 计算地面传感器覆盖
-        for sensor in ground_sensors:
-            sensor_point = Point(sensor.x, sensor.y)
-            for i, point in enumerate(self.grid_points):
-                if sensor_point.distance(Point(point)) <= sensor.radius:
-                    covered_points.add(i)
+        # 卫星条带按轨道方向投影解析判断，只有边界附近的点才交给 shapely
+        for satellite in satellites:
+            covered_mask |= satellite.mask(xs, ys)
+        
+        # 地面传感器为圆形覆盖，按网格分块一次广播判断所有传感器，不经过 shapely
+        if ground_sensors:
+            _, ground_xyr = self._sensor_arrays([], ground_sensors)
+            center_x, center_y, radius = ground_xyr[:, 0, None], ground_xyr[:, 1, None], ground_xyr[:, 2, None]
+            block = max(256, NUMPY_BLOCK_BYTES // (ground_xyr.itemsize * len(ground_xyr)))
+            for start in range(0, len(xs), block):
+                distance = point_distance(xs[start:start + block], ys[start:start + block], center_x, center_y)
+                covered_mask[start:start + block] |= (distance <= radius).any(axis=0)
+        
+        return covered_mask
+    
+    def _fused_mask(self, satellites: List[Satellite],
+                    ground_sensors: List[GroundSensor]) -> np.ndarray:
+        """用 Numba 内核一次遍历网格点计算覆盖掩码，边界附近的点再精确复核"""
+        sat_params, ground_xyr = self._sensor_arrays(satellites, ground_sensors)
+        
+        scale = max(1.0, np.abs(self.xs).max(), np.abs(self.ys).max(),
+                    np.abs(ground_xyr).max(initial=0.0), np.abs(sat_params).max(initial=0.0))
+        state = _coverage_state_kernel(self.xs, self.ys, ground_xyr, sat_params,
+                                       BOUNDARY_RTOL * scale)
+        
+        covered_mask = state == 1
+        uncertain = np.flatnonzero(state == 2)
+        if len(uncertain) > 0:
+            covered_mask[uncertain] = self._exact_mask(
+                satellites, ground_sensors, self.xs[uncertain], self.ys[uncertain])
+        return covered_mask
+    
+    @staticmethod
+    def _sensor_arrays(satellites: List[Satellite],
+                       ground_sensors: List[GroundSensor]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        将传感器对象列表整理为连续的数值数组，供内核按行顺序读取
         
-        coverage_ratio = len(covered_points) / len(self.grid_points) if self.grid_points else 0.0
-        return coverage_ratio, covered_points
+        返回:
+            卫星条带参数 (m, 7)：起点 x、y，轨道单位方向 x、y，沿轨范围下限、上限，半幅宽
+            地面传感器参数 (n, 3)：x、y、半径
+        """
+        sat_params = np.array([sat.strip_params() for sat in satellites],
+                              dtype=np.float64).reshape(-1, 7)
+        ground_xyr = np.array([(g.x, g.y, g.radius) for g in ground_sensors],
+                              dtype=np.float64).reshape(-1, 3)
+        return sat_params, ground_xyr
     
     def identify_coverage_gaps(self, satellites: List[Satellite], 
                              ground_sensors: List[GroundSensor]) -> List[Tuple[float, float]]:
@@ -181,12 +385,13 @@ class HybridSensorAdditionOptimizer:
         返回:
             未覆盖区域的中心点列表
         """
-        _, covered_points = self.evaluate_deployment(satellites, ground_sensors)
-        
-        uncovered_points = []
-        for i, point in enumerate(self.grid_points):
-            if i not in covered_points:
-                uncovered_points.append(point)
+        covered_mask = self.evaluate_masks(satellites, ground_sensors)
+        return self._gaps_from_mask(covered_mask)
+    
+    def _gaps_from_mask(self, covered_mask: np.ndarray) -> List[Tuple[float, float]]:
+        """根据覆盖掩码取出未覆盖的网格点"""
+        uncovered_idx = np.flatnonzero(~covered_mask)
+        uncovered_points = list(zip(self.xs[uncovered_idx].tolist(), self.ys[uncovered_idx].tolist()))
         
         if not uncovered_points:
             return []
@@ -198,7 +403,11 @@ class HybridSensorAdditionOptimizer:
     def generate_addition_candidates(self, satellites: List[Satellite], 
                                    ground_sensors: List[GroundSensor],
                                    max_satellite_cost: float = 100,
-                                   max_ground_sensor_cost: float = 20) -> List[AdditionCandidate]:
+                                   max_ground_sensor_cost: float = 20,
+                                   base_mask: np.ndarray = None,
+                                   max_budget: float = None,
+                                   spent_cost: float = 0.0,
+                                   n_jobs: int = None) -> List[AdditionCandidate]:
         """
         生成增补候选传感器（包括卫星和地面传感器）
         
@@ -207,90 +416,184 @@ class HybridSensorAdditionOptimizer:
             ground_sensors: 现有地面传感器
             max_satellite_cost: 卫星最大成本
             max_ground_sensor_cost: 地面传感器最大成本
+            base_mask: 现有传感器的覆盖掩码，已知时传入可省去重新评估
+            max_budget: 最大预算，给定时只保证返回列表首项为预算内的最佳候选，
+                超出预算或增益上界不可能胜出的候选不再精确评估
+            spent_cost: 已花费的成本，与 max_budget 配合使用
+            n_jobs: 并行评估候选的线程数，默认使用全部 CPU 核心
             
         返回:
             候选增补传感器列表
         """
         candidates = []
-        coverage_gaps = self.identify_coverage_gaps(satellites, ground_sensors)
+        
+        # 现有传感器的覆盖掩码在本次候选生成中不变，只计算一次
+        if base_mask is None:
+            base_mask = self.evaluate_masks(satellites, ground_sensors)
+        coverage_gaps = self._gaps_from_mask(base_mask)
         
         if not coverage_gaps:
             return candidates
         
-        minx, miny, maxx, maxy = self.target_area.bounds
+        # 未覆盖掩码只取反一次，各候选的增益直接与之求交计数
+        uncovered_mask = ~base_mask
+        
+        # 只需找最佳候选时，按未覆盖点数的前缀和求候选 x 范围内的增益上界
+        uncovered_prefix = None
+        if max_budget is not None:
+            uncovered_prefix = np.concatenate(([0], np.cumsum(uncovered_mask)))
         
         # 为每个覆盖缺口生成候选传感器
         gap_centers = self._cluster_gaps(coverage_gaps)
         
-        for center in gap_centers:
-            # 候选地面传感器
-            for radius in [1.5, 2.0, 2.5, 3.0]:
-                cost = 8 + radius * 3  # 成本与半径相关
-                if cost <= max_ground_sensor_cost:
-                    expected_gain = self._estimate_coverage_gain_ground(
-                        center[0], center[1], radius, satellites, ground_sensors
-                    )
-                    
-                    if expected_gain > 0:
-                        candidates.append(AdditionCandidate(
-                            sensor_type='ground',
-                            position_params={'x': center[0], 'y': center[1], 'radius': radius},
-                            cost=cost,
-                            expected_coverage_gain=expected_gain,
-                            cost_effectiveness=expected_gain / cost
-                        ))
-            
-            # 候选卫星（通过覆盖缺口的轨道）
-            for swath_width in [2.0, 2.5, 3.0, 3.5]:
-                # 生成通过缺口中心的不同方向轨道
-                for angle in [0, 45, 90, 135]:  # 不同轨道倾角
-                    angle_rad = np.radians(angle)
-                    
-                    # 计算轨道起止点
-                    if angle == 0 or angle == 180:  # 南北向
-                        start_x = center[0]
-                        start_y = miny
-                        end_x = center[0]
-                        end_y = maxy
-                    elif angle == 90:  # 东西向
-                        start_x = minx
-                        start_y = center[1]
-                        end_x = maxx
-                        end_y = center[1]
-                    else:  # 斜向
-                        # 简化处理，生成通过中心点的斜向轨道
-                        length = min(maxx - minx, maxy - miny)
-                        dx = length * np.cos(angle_rad) / 2
-                        dy = length * np.sin(angle_rad) / 2
-                        start_x = max(minx, center[0] - dx)
-                        start_y = max(miny, center[1] - dy)
-                        end_x = min(maxx, center[0] + dx)
-                        end_y = min(maxy, center[1] + dy)
-                    
-                    cost = 70 + swath_width * 8  # 成本与轨道宽度相关
-                    if cost <= max_satellite_cost:
-                        expected_gain = self._estimate_coverage_gain_satellite(
-                            start_x, start_y, end_x, end_y, swath_width, 
-                            satellites, ground_sensors
-                        )
-                        
-                        if expected_gain > 0:
-                            candidates.append(AdditionCandidate(
-                                sensor_type='satellite',
-                                position_params={
-                                    'start_x': start_x, 'start_y': start_y,
-                                    'end_x': end_x, 'end_y': end_y,
-                                    'swath_width': swath_width
-                                },
-                                cost=cost,
-                                expected_coverage_gain=expected_gain,
-                                cost_effectiveness=expected_gain / cost
-                            ))
+        # 一次算出所有缺口中心、所有倾角的候选轨道起止点 (中心数, 倾角数, 4)
+        tracks = self._satellite_tracks(np.asarray(gap_centers, dtype=np.float64)).tolist()
+        
+        def evaluate_center(center_and_tracks):
+            center, center_tracks = center_and_tracks
+            return self._center_candidates(center, center_tracks, uncovered_mask, uncovered_prefix,
+                                           max_satellite_cost, max_ground_sensor_cost,
+                                           max_budget, spent_cost)
+        
+        # 各缺口中心的候选相互独立，网格点较多时按中心交给线程池并行评估，
+        # NumPy 掩码运算期间会释放 GIL；按中心顺序拼接，排序结果与串行一致
+        n_jobs = n_jobs or os.cpu_count() or 1
+        if n_jobs > 1 and len(gap_centers) > 1 and len(self.xs) >= PARALLEL_MIN_POINTS:
+            with ThreadPoolExecutor(max_workers=min(n_jobs, len(gap_centers))) as executor:
+                center_candidates = list(executor.map(evaluate_center, zip(gap_centers, tracks)))
+        else:
+            center_candidates = map(evaluate_center, zip(gap_centers, tracks))
+        
+        for candidates_of_center in center_candidates:
+            candidates.extend(candidates_of_center)
         
         # 按成本效益排序
         candidates.sort(key=lambda x: x.cost_effectiveness, reverse=True)
         return candidates
     
+    def _center_candidates(self, center: Tuple[float, float], center_tracks: List[List[float]],
+                           uncovered_mask: np.ndarray, uncovered_prefix: np.ndarray,
+                           max_satellite_cost: float, max_ground_sensor_cost: float,
+                           max_budget: float, spent_cost: float) -> List[AdditionCandidate]:
+        """
+        生成单个缺口中心处的候选传感器
+        
+        给定 uncovered_prefix 时，超出预算的候选直接跳过；增益上界的成本效益已低于
+        本中心当前最佳的候选不可能成为最佳候选，也不再精确评估
+        """
+        candidates = []
+        screen = uncovered_prefix is not None
+        best_effectiveness = 0.0
+        
+        # 候选地面传感器
+        for radius in [1.5, 2.0, 2.5, 3.0]:
+            cost = 8 + radius * 3  # 成本与半径相关
+            if cost <= max_ground_sensor_cost:
+                if screen:
+                    if spent_cost + cost > max_budget:
+                        continue
+                    upper_gain = self._gain_upper_bound(
+                        center[0] - radius, center[0] + radius, uncovered_prefix
+                    )
+                    if upper_gain / cost < best_effectiveness:
+                        continue
+                
+                expected_gain, grid_slice, new_mask = self._estimate_coverage_gain_ground(
+                    center[0], center[1], radius, uncovered_mask
+                )
+                
+                if expected_gain > 0:
+                    candidates.append(AdditionCandidate(
+                        sensor_type='ground',
+                        position_params={'x': center[0], 'y': center[1], 'radius': radius},
+                        cost=cost,
+                        expected_coverage_gain=expected_gain,
+                        cost_effectiveness=expected_gain / cost,
+                        coverage_slice=grid_slice,
+                        coverage_mask=new_mask
+                    ))
+                    best_effectiveness = max(best_effectiveness, expected_gain / cost)
+        
+        # 候选卫星（通过覆盖缺口的轨道）
+        for swath_width in [2.0, 2.5, 3.0, 3.5]:
+            cost = 70 + swath_width * 8  # 成本与轨道宽度相关
+            if cost > max_satellite_cost:
+                continue
+            if screen and spent_cost + cost > max_budget:
+                continue
+            
+            # 通过缺口中心的不同方向轨道
+            for start_x, start_y, end_x, end_y in center_tracks:
+                if screen:
+                    minx, _, maxx, _ = Satellite(
+                        -1, start_x, start_y, end_x, end_y, swath_width, 0
+                    ).bounds()
+                    upper_gain = self._gain_upper_bound(minx, maxx, uncovered_prefix)
+                    if upper_gain / cost < best_effectiveness:
+                        continue
+                
+                expected_gain, grid_slice, new_mask = self._estimate_coverage_gain_satellite(
+                    start_x, start_y, end_x, end_y, swath_width, uncovered_mask
+                )
+                
+                if expected_gain > 0:
+                    candidates.append(AdditionCandidate(
+                        sensor_type='satellite',
+                        position_params={
+                            'start_x': start_x, 'start_y': start_y,
+                            'end_x': end_x, 'end_y': end_y,
+                            'swath_width': swath_width
+                        },
+                        cost=cost,
+                        expected_coverage_gain=expected_gain,
+                        cost_effectiveness=expected_gain / cost,
+                        coverage_slice=grid_slice,
+                        coverage_mask=new_mask
+                    ))
+                    best_effectiveness = max(best_effectiveness, expected_gain / cost)
+        
+        return candidates
+    
+    def _satellite_tracks(self, centers: np.ndarray) -> np.ndarray:
+        """
+        计算通过各缺口中心、各倾角的候选轨道起止点
+        
+        参数:
+            centers: 缺口中心 (中心数, 2)
+            
+        返回:
+            (中心数, 倾角数, 4) 数组，最后一维为 start_x, start_y, end_x, end_y
+        """
+        minx, miny, maxx, maxy = self._bounds
+        center_x = centers[:, 0, None]
+        center_y = centers[:, 1, None]
+        
+        # 斜向轨道：从中心沿方向向两侧各延伸半个长度，并裁剪到区域外包矩形
+        length = min(maxx - minx, maxy - miny)
+        dx = length * TRACK_DIRECTIONS[:, 0] / 2
+        dy = length * TRACK_DIRECTIONS[:, 1] / 2
+        tracks = np.stack([
+            np.maximum(minx, center_x - dx),
+            np.maximum(miny, center_y - dy),
+            np.minimum(maxx, center_x + dx),
+            np.minimum(maxy, center_y + dy)
+        ], axis=-1)
+        
+        # 南北向、东西向轨道贯穿整个区域
+        angles = np.asarray(SATELLITE_TRACK_ANGLES)
+        north_south = angles == 0
+        tracks[:, north_south, 0] = center_x
+        tracks[:, north_south, 1] = miny
+        tracks[:, north_south, 2] = center_x
+        tracks[:, north_south, 3] = maxy
+        east_west = angles == 90
+        tracks[:, east_west, 0] = minx
+        tracks[:, east_west, 1] = center_y
+        tracks[:, east_west, 2] = maxx
+        tracks[:, east_west, 3] = center_y
+        
+        return tracks
+    
     def _cluster_gaps(self, gaps: List[Tuple[float, float]], 
                      max_clusters: int = 5) -> List[Tuple[float, float]]:
         """
@@ -306,46 +609,73 @@ class HybridSensorAdditionOptimizer:
         if len(gaps) <= max_clusters:
             return gaps
         
-        # 简化版本：随机采样代表性点
-        # 实际可以使用K-means聚类
-        np.random.seed(42)
-        selected_indices = np.random.choice(len(gaps), max_clusters, replace=False)
+        # k-means++ 播种：首个中心随机选取，之后按到最近已选中心距离的平方加权抽样，
+        # 使缺口中心分散在不同的缺口区域，避免候选集中在相邻位置
+        points = np.asarray(gaps, dtype=np.float64)
+        rng = np.random.default_rng(42)
+        
+        selected_indices = [int(rng.integers(len(points)))]
+        nearest_d2 = ((points - points[selected_indices[0]]) ** 2).sum(axis=1)
+        for _ in range(max_clusters - 1):
+            total = nearest_d2.sum()
+            if total <= 0:
+                break
+            index = int(rng.choice(len(points), p=nearest_d2 / total))
+            selected_indices.append(index)
+            nearest_d2 = np.minimum(nearest_d2, ((points - points[index]) ** 2).sum(axis=1))
+        
         return [gaps[i] for i in selected_indices]
     
     def _estimate_coverage_gain_ground(self, x: float, y: float, radius: float,
-                                     existing_satellites: List[Satellite],
-                                     existing_ground_sensors: List[GroundSensor]) -> float:
-        """估算地面传感器的覆盖增益"""
+                                     uncovered_mask: np.ndarray
+                                     ) -> Tuple[float, slice, np.ndarray]:
+        """估算地面传感器的覆盖增益，同时返回其覆盖掩码及对应的网格点区间"""
         # 创建临时传感器
         temp_sensor = GroundSensor(-1, x, y, radius, 0)
         
-        # 计算添加前后的覆盖差异
-        original_coverage, _ = self.evaluate_deployment(existing_satellites, existing_ground_sensors)
-        new_coverage, _ = self.evaluate_deployment(existing_satellites, 
-                                                  existing_ground_sensors + [temp_sensor])
-        
-        return new_coverage - original_coverage
+        # 覆盖增益即新传感器覆盖到的、现有方案未覆盖的网格点比例，
+        # 只有 x 落在覆盖范围内的连续一段网格点可能被覆盖
+        grid_slice = self._grid_slice(x - radius, x + radius)
+        new_mask = temp_sensor.mask(self.xs[grid_slice], self.ys[grid_slice])
+        gain = np.count_nonzero(new_mask & uncovered_mask[grid_slice]) / len(uncovered_mask)
+        return gain, grid_slice, new_mask
     
     def _estimate_coverage_gain_satellite(self, start_x: float, start_y: float,
                                         end_x: float, end_y: float, swath_width: float,
-                                        existing_satellites: List[Satellite],
-                                        existing_ground_sensors: List[GroundSensor]) -> float:
-        """估算卫星的覆盖增益"""
+                                        uncovered_mask: np.ndarray
+                                        ) -> Tuple[float, slice, np.ndarray]:
+        """估算卫星的覆盖增益，同时返回其覆盖掩码及对应的网格点区间"""
         # 创建临时卫星
         temp_satellite = Satellite(-1, start_x, start_y, end_x, end_y, swath_width, 0)
         
-        # 计算添加前后的覆盖差异
-        original_coverage, _ = self.evaluate_deployment(existing_satellites, existing_ground_sensors)
-        new_coverage, _ = self.evaluate_deployment(existing_satellites + [temp_satellite], 
-                                                  existing_ground_sensors)
-        
-        return new_coverage - original_coverage
+        # 覆盖增益即新卫星覆盖到的、现有方案未覆盖的网格点比例，
+        # 只有 x 落在条带外包矩形内的连续一段网格点可能被覆盖
+        minx, _, maxx, _ = temp_satellite.bounds()
+        grid_slice = self._grid_slice(minx, maxx)
+        new_mask = temp_satellite.mask(self.xs[grid_slice], self.ys[grid_slice])
+        gain = np.count_nonzero(new_mask & uncovered_mask[grid_slice]) / len(uncovered_mask)
+        return gain, grid_slice, new_mask
+    
+    def _gain_upper_bound(self, minx: float, maxx: float,
+                          uncovered_prefix: np.ndarray) -> float:
+        """x 范围 [minx, maxx] 内未覆盖网格点的比例，即该范围内候选覆盖增益的上界"""
+        grid_slice = self._grid_slice(minx, maxx)
+        upper = uncovered_prefix[grid_slice.stop] - uncovered_prefix[grid_slice.start]
+        return upper / (len(uncovered_prefix) - 1)
+    
+    def _grid_slice(self, minx: float, maxx: float) -> slice:
+        """x 坐标落在 [minx, maxx] 内的网格点区间，两端留出边界容差"""
+        pad = BOUNDARY_RTOL * max(1.0, abs(minx), abs(maxx))
+        lo = np.searchsorted(self.xs, minx - pad, side='left')
+        hi = np.searchsorted(self.xs, maxx + pad, side='right')
+        return slice(int(lo), int(hi))
     
     def optimize_additions_greedy(self, satellites: List[Satellite], 
                                 ground_sensors: List[GroundSensor],
                                 target_coverage: float,
                                 max_budget: float = float('inf'),
-                                max_additions: int = 10) -> HybridAdditionSolution:
+                                max_additions: int = 10,
+                                n_jobs: int = None) -> HybridAdditionSolution:
         """
         使用贪心算法优化混合传感器增补方案
         
@@ -355,6 +685,7 @@ class HybridSensorAdditionOptimizer:
             target_coverage: 目标覆盖率
             max_budget: 最大预算
             max_additions: 最大增补数量
+            n_jobs: 并行评估候选的线程数，默认使用全部 CPU 核心
             
         返回:
             增补优化结果
@@ -365,8 +696,9 @@ class HybridSensorAdditionOptimizer:
         
         start_time = time.time()
         
-        # 评估原始方案
-        original_coverage, _ = self.evaluate_deployment(satellites, ground_sensors)
+        # 评估原始方案，之后只把新增传感器的掩码并入当前覆盖掩码
+        current_mask = self.evaluate_masks(satellites, ground_sensors)
+        original_coverage = self._coverage_ratio(current_mask)
         print(f"原始覆盖率: {original_coverage*100:.2f}%")
         
         if original_coverage >= target_coverage:
@@ -390,7 +722,8 @@ class HybridSensorAdditionOptimizer:
             
             # 生成当前状态下的候选增补
             candidates = self.generate_addition_candidates(
-                current_satellites, current_ground_sensors
+                current_satellites, current_ground_sensors, base_mask=current_mask,
+                max_budget=max_budget, spent_cost=total_cost, n_jobs=n_jobs
             )
             
             if not candidates:
@@ -435,8 +768,10 @@ class HybridSensorAdditionOptimizer:
                 current_ground_sensors.append(new_sensor)
                 added_ground_sensors.append(new_sensor)
             
+            # 候选的覆盖掩码在估算增益时已算出，直接并入当前覆盖
+            current_mask[best_candidate.coverage_slice] |= best_candidate.coverage_mask
             total_cost += best_candidate.cost
-            current_coverage, _ = self.evaluate_deployment(current_satellites, current_ground_sensors)
+            current_coverage = self._coverage_ratio(current_mask)
             
             print(f"增补 {iteration+1}: {best_candidate.sensor_type}, "
                   f"成本: {best_candidate.cost:.1f}, "
@@ -523,61 +858,26 @@ class HybridSensorAdditionOptimizer:
         ax.plot(x_coords, y_coords, 'b-', linewidth=2, label='目标区域')
         ax.fill(x_coords, y_coords, alpha=0.2, color='lightblue')
         
-        # 绘制原有卫星
-        for i, sat in enumerate(original_satellites):
-            coverage = sat.get_coverage_area()
-            if coverage and not coverage.is_empty:
-                x_coords, y_coords = coverage.exterior.xy
-                ax.plot(x_coords, y_coords, 'r-', alpha=0.6, linewidth=1)
-                ax.fill(x_coords, y_coords, alpha=0.15, color='red')
-                
-                ax.plot([sat.start_x, sat.end_x], [sat.start_y, sat.end_y], 
-                       'r-', linewidth=2, alpha=0.8)
-                ax.text((sat.start_x + sat.end_x)/2, (sat.start_y + sat.end_y)/2, 
-                       f'S{i+1}', fontsize=8, ha='center', va='center',
-                       bbox=dict(boxstyle='round,pad=0.2', facecolor='red', alpha=0.7))
-        
-        # 绘制新增卫星
-        for i, sat in enumerate(added_satellites):
-            coverage = sat.get_coverage_area()
-            if coverage and not coverage.is_empty:
-                x_coords, y_coords = coverage.exterior.xy
-                ax.plot(x_coords, y_coords, 'orange', alpha=0.8, linewidth=2)
-                ax.fill(x_coords, y_coords, alpha=0.25, color='orange')
-                
-                ax.plot([sat.start_x, sat.end_x], [sat.start_y, sat.end_y], 
-                       'orange', linewidth=3, alpha=1.0)
-                ax.text((sat.start_x + sat.end_x)/2, (sat.start_y + sat.end_y)/2, 
-                       f'NS{i+1}', fontsize=8, ha='center', va='center',
-                       bbox=dict(boxstyle='round,pad=0.2', facecolor='orange', alpha=0.8))
-        
-        # 绘制原有地面传感器
-        for i, sensor in enumerate(original_ground_sensors):
-            circle = plt.Circle((sensor.x, sensor.y), sensor.radius, 
-                              fill=False, color='green', alpha=0.6, linewidth=1)
-            ax.add_patch(circle)
-            circle_fill = plt.Circle((sensor.x, sensor.y), sensor.radius, 
-                                   fill=True, color='green', alpha=0.15)
-            ax.add_patch(circle_fill)
-            
-            ax.plot(sensor.x, sensor.y, 'go', markersize=6)
-            ax.text(sensor.x, sensor.y + sensor.radius + 0.2, f'G{i+1}', 
-                   fontsize=8, ha='center', va='bottom',
-                   bbox=dict(boxstyle='round,pad=0.2', facecolor='green', alpha=0.7))
-        
-        # 绘制新增地面传感器
-        for i, sensor in enumerate(added_ground_sensors):
-            circle = plt.Circle((sensor.x, sensor.y), sensor.radius, 
-                              fill=False, color='purple', alpha=0.8, linewidth=2)
-            ax.add_patch(circle)
-            circle_fill = plt.Circle((sensor.x, sensor.y), sensor.radius, 
-                                   fill=True, color='purple', alpha=0.25)
-            ax.add_patch(circle_fill)
-            
-            ax.plot(sensor.x, sensor.y, 'o', color='purple', markersize=8)
-            ax.text(sensor.x, sensor.y + sensor.radius + 0.2, f'NG{i+1}', 
-                   fontsize=8, ha='center', va='bottom',
-                   bbox=dict(boxstyle='round,pad=0.2', facecolor='purple', alpha=0.8))
+        # 标出仍未覆盖的网格点，便于直观检查增补效果
+        uncovered_xs, uncovered_ys = self._uncovered_points(
+            original_satellites + added_satellites,
+            original_ground_sensors + added_ground_sensors
+        )
+        ax.scatter(uncovered_xs, uncovered_ys, s=1, c='red', label='未覆盖点')
+        
+        # 每组传感器的覆盖区域、轨道和位置各合并为一个集合对象绘制
+        self._plot_satellite_group(ax, original_satellites, 'red', 'S',
+                                   edge_alpha=0.6, fill_alpha=0.15, linewidth=1,
+                                   track_alpha=0.8, track_width=2, label_alpha=0.7)
+        self._plot_satellite_group(ax, added_satellites, 'orange', 'NS',
+                                   edge_alpha=0.8, fill_alpha=0.25, linewidth=2,
+                                   track_alpha=1.0, track_width=3, label_alpha=0.8)
+        self._plot_ground_group(ax, original_ground_sensors, 'green', 'G',
+                                edge_alpha=0.6, fill_alpha=0.15, linewidth=1,
+                                markersize=6, label_alpha=0.7)
+        self._plot_ground_group(ax, added_ground_sensors, 'purple', 'NG',
+                                edge_alpha=0.8, fill_alpha=0.25, linewidth=2,
+                                markersize=8, label_alpha=0.8)
         
         ax.set_xlabel('X 坐标')
         ax.set_ylabel('Y 坐标')
@@ -586,10 +886,59 @@ class HybridSensorAdditionOptimizer:
         ax.set_aspect('equal')
         
         # 设置坐标轴范围
-        minx, miny, maxx, maxy = self.target_area.bounds
+        minx, miny, maxx, maxy = self._bounds
         margin = (maxx - minx) * 0.1
         ax.set_xlim(minx - margin, maxx + margin)
         ax.set_ylim(miny - margin, maxy + margin)
+    
+    def _uncovered_points(self, satellites: List[Satellite],
+                          ground_sensors: List[GroundSensor]) -> Tuple[np.ndarray, np.ndarray]:
+        """返回给定传感器方案下未覆盖网格点的 x、y 坐标"""
+        uncovered = ~self.evaluate_masks(satellites, ground_sensors)
+        return self.xs[uncovered], self.ys[uncovered]
+    
+    def _plot_satellite_group(self, ax, satellites, color, label_prefix, edge_alpha,
+                              fill_alpha, linewidth, track_alpha, track_width, label_alpha):
+        """绘制一组卫星的覆盖条带、轨道和编号"""
+        shown = [(i, sat) for i, sat in enumerate(satellites)
+                 if not sat.get_coverage_area().is_empty]
+        if not shown:
+            return
+        
+        strips = [np.asarray(sat.get_coverage_area().exterior.coords) for _, sat in shown]
+        ax.add_collection(PolyCollection(strips,
+                                         facecolor=to_rgba(color, fill_alpha),
+                                         edgecolor=to_rgba(color, edge_alpha),
+                                         linewidth=linewidth))
+        
+        tracks = [[(sat.start_x, sat.start_y), (sat.end_x, sat.end_y)] for _, sat in shown]
+        ax.add_collection(LineCollection(tracks, colors=to_rgba(color, track_alpha),
+                                         linewidths=track_width))
+        
+        label_bbox = dict(boxstyle='round,pad=0.2', facecolor=color, alpha=label_alpha)
+        for i, sat in shown:
+            ax.text((sat.start_x + sat.end_x)/2, (sat.start_y + sat.end_y)/2, 
+                   f'{label_prefix}{i+1}', fontsize=8, ha='center', va='center', bbox=label_bbox)
+    
+    def _plot_ground_group(self, ax, ground_sensors, color, label_prefix, edge_alpha,
+                           fill_alpha, linewidth, markersize, label_alpha):
+        """绘制一组地面传感器的覆盖圆、位置和编号"""
+        if not ground_sensors:
+            return
+        
+        circles = [Circle((sensor.x, sensor.y), sensor.radius) for sensor in ground_sensors]
+        ax.add_collection(PatchCollection(circles,
+                                          facecolor=to_rgba(color, fill_alpha),
+                                          edgecolor=to_rgba(color, edge_alpha),
+                                          linewidth=linewidth))
+        
+        ax.plot([sensor.x for sensor in ground_sensors], [sensor.y for sensor in ground_sensors],
+                'o', color=color, markersize=markersize)
+        
+        label_bbox = dict(boxstyle='round,pad=0.2', facecolor=color, alpha=label_alpha)
+        for i, sensor in enumerate(ground_sensors):
+            ax.text(sensor.x, sensor.y + sensor.radius + 0.2, f'{label_prefix}{i+1}', 
+                   fontsize=8, ha='center', va='bottom', bbox=label_bbox)
 
 
 def demo_hybrid_sensor_addition_optimize():
@@ -16,15 +16,70 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from matplotlib.collections import LineCollection, PatchCollection, PolyCollection
+from matplotlib.colors import to_rgba
+from matplotlib.patches import Circle
 from shapely.geometry import Polygon, Point
-from typing import List, Tuple, Dict
-import random
+from typing import List, Tuple, Dict, Optional
 import math
+import os
 import time
-from dataclasses import dataclass
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field, fields
 import warnings
 warnings.filterwarnings('ignore')
 
+from geometry_utils import contains_xy, intersects_xy, pack_bits, point_distance, popcount
+
+# 解析覆盖判断的边界容差（相对坐标量级）：距覆盖边界不超过该容差的网格点
+# 改用 shapely 精确判定，保证与按多边形计算的结果完全一致
+BOUNDARY_RTOL = 1e-9
+
+try:
+    from numba import njit, prange, set_num_threads, types
+    from numba.extending import intrinsic
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# 种群规模 × 候选传感器数 × 位集字数超过该值时使用 Numba 内核批量计算覆盖，
+# 否则用 NumPy 一次广播，临时数组不超过该数量的 uint64
+NUMBA_MIN_WORK = 1 << 16
+
+# 覆盖点数缓存的最大条目数，达到后在下一次批量评估前清空
+COVERAGE_CACHE_SIZE = 100_000
+
+if NUMBA_AVAILABLE:
+    @intrinsic
+    def _popcount64(typingctx, x):
+        """统计 uint64 中置位的数量，直接生成 llvm.ctpop.i64（支持时编译为单条 POPCNT 指令）"""
+        def codegen(context, builder, signature, args):
+            return builder.ctpop(args[0])
+        return types.int64(types.uint64), codegen
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _population_coverage_kernel(selection, sensor_bits):
+        """
+        计算种群中每个方案的覆盖位集及覆盖的网格点数
+        
+        selection 为 (种群规模, 传感器数) 的选择位向量，sensor_bits 为 (传感器数, 字数) 的覆盖位集
+        """
+        n_words = sensor_bits.shape[1]
+        unions = np.zeros((selection.shape[0], n_words), dtype=np.uint64)
+        counts = np.zeros(selection.shape[0], dtype=np.int64)
+        for p in prange(selection.shape[0]):
+            for s in range(selection.shape[1]):
+                if selection[p, s]:
+                    for w in range(n_words):
+                        unions[p, w] |= sensor_bits[s, w]
+            total = 0
+            for w in range(n_words):
+                total += _popcount64(unions[p, w])
+            counts[p] = total
+        return unions, counts
+
 plt.rcParams['font.sans-serif'] = ['SimHei']
 plt.rcParams['axes.unicode_minus'] = False
 
@@ -38,17 +93,36 @@ class Satellite:
     end_y: float
     swath_width: float  # 条带宽度
     cost: float = 100.0
+    # 条带解析参数与覆盖多边形缓存，传感器参数创建后不再修改
+    _strip: Tuple[float, float, float, float, float, float, float] = field(
+        default=None, init=False, repr=False, compare=False)
+    _coverage: Polygon = field(default=None, init=False, repr=False, compare=False)
     
-    def get_coverage_area(self) -> Polygon:
-        """获取卫星覆盖区域的多边形（条带状）"""
-        # 计算条带方向向量
+    def __post_init__(self):
+        # 方向向量的开方和除法只在创建时计算一次
         dx = self.end_x - self.start_x
         dy = self.end_y - self.start_y
         length = math.sqrt(dx**2 + dy**2)
+        half_width = self.swath_width / 2
         
         if length == 0:
+            # 起止点重合时覆盖区域为以起点为中心的正方形
+            self._strip = (self.start_x, self.start_y, 1.0, 0.0, -half_width, half_width, half_width)
+        else:
+            self._strip = (self.start_x, self.start_y, dx / length, dy / length, 0.0, length, half_width)
+    
+    def get_coverage_area(self) -> Polygon:
+        """获取卫星覆盖区域的多边形（条带状），首次构造后缓存在实例上"""
+        if self._coverage is None:
+            self._coverage = self._build_coverage_area()
+        return self._coverage
+    
+    def _build_coverage_area(self) -> Polygon:
+        """按缓存的条带参数构造条带多边形"""
+        _, _, unit_dx, unit_dy, along_min, _, half_width = self._strip
+        
+        if along_min < 0:
             # 如果起点终点相同，创建一个小的正方形区域
-            half_width = self.swath_width / 2
             return Polygon([
                 (self.start_x - half_width, self.start_y - half_width),
                 (self.start_x + half_width, self.start_y - half_width),
@@ -56,13 +130,9 @@ class Satellite:
                 (self.start_x - half_width, self.start_y + half_width)
             ])
         
-        # 单位方向向量
-        unit_dx = dx / length
-        unit_dy = dy / length
-        
         # 垂直方向向量（用于条带宽度）
-        perp_dx = -unit_dy * self.swath_width / 2
-        perp_dy = unit_dx * self.swath_width / 2
+        perp_dx = -unit_dy * half_width
+        perp_dy = unit_dx * half_width
         
         # 构建条带多边形的四个顶点
         vertices = [
@@ -73,6 +143,48 @@ class Satellite:
         ]
         
         return Polygon(vertices)
+    
+    def strip_params(self) -> Tuple[float, float, float, float, float, float, float]:
+        """
+        条带的解析参数：起点 x、y，轨道单位方向 x、y，沿轨范围下限、上限，半幅宽
+        """
+        return self._strip
+    
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """条带覆盖区域的外包矩形 (minx, miny, maxx, maxy)"""
+        start_x, start_y, ux, uy, along_min, along_max, half_width = self.strip_params()
+        corner_x = [start_x + a * ux + side * half_width * uy
+                    for a in (along_min, along_max) for side in (-1, 1)]
+        corner_y = [start_y + a * uy - side * half_width * ux
+                    for a in (along_min, along_max) for side in (-1, 1)]
+        return min(corner_x), min(corner_y), max(corner_x), max(corner_y)
+    
+    def mask(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        判断各点是否在卫星条带内部（不含边界）
+        
+        按轨道方向投影解析判断；距条带边界很近的点交给 shapely 按多边形精确判定，
+        与 get_coverage_area().contains 的结果一致
+        """
+        start_x, start_y, ux, uy, along_min, along_max, half_width = self.strip_params()
+        # 以条带中心为原点，四个半平面约束合并为沿轨、垂轨两个对称区间判断
+        center = (along_min + along_max) / 2
+        half_length = (along_max - along_min) / 2
+        px = xs - (start_x + center * ux)
+        py = ys - (start_y + center * uy)
+        along = np.abs(px * ux + py * uy)
+        perp = np.abs(py * ux - px * uy)
+        margin = np.minimum(half_length - along, half_width - perp)
+        
+        scale = max(1.0, abs(start_x), abs(start_y), along_max, half_width,
+                    np.abs(xs).max(initial=0.0), np.abs(ys).max(initial=0.0))
+        tol = BOUNDARY_RTOL * scale
+        inside = margin > tol
+        
+        near = np.flatnonzero(np.abs(margin) <= tol)
+        if len(near) > 0:
+            inside[near] = contains_xy(self.get_coverage_area(), xs[near], ys[near])
+        return inside
 
 @dataclass
 class GroundSensor:
@@ -96,7 +208,12 @@ class ResourceConstraints:
     target_coverage_ratio: float = 0.9
 
 class SensorSelectionSolution:
-    """传感器选择方案"""
+    """
+    传感器选择方案
+    
+    选择结果为卫星与地面传感器的编号列表，优化器需要选择位向量时再由列表生成。
+    遗传算法在 Population 的结构数组上进化，最佳解以本类返回
+    """
     def __init__(self):
         self.selected_satellites: List[int] = []
         self.selected_ground_sensors: List[int] = []
@@ -104,6 +221,24 @@ class SensorSelectionSolution:
         self.coverage_ratio: float = 0.0
         self.total_cost: float = 0.0
         self.penalty: float = 0.0
+        # 覆盖位集及计算它时的选择，未知时为 None；只整体替换、不原地修改，副本之间可共享
+        self.coverage_bits: Optional[np.ndarray] = None
+        self._coverage_key: Optional[tuple] = None
+    
+    def _selection_key(self) -> tuple:
+        """当前选择的不可变表示，用于判断覆盖位集是否仍然有效"""
+        return tuple(self.selected_satellites), tuple(self.selected_ground_sensors)
+    
+    def set_coverage_bits(self, bits: Optional[np.ndarray]):
+        """记录当前选择的覆盖位集"""
+        self.coverage_bits = bits
+        self._coverage_key = self._selection_key() if bits is not None else None
+    
+    def known_coverage_bits(self) -> Optional[np.ndarray]:
+        """返回与当前选择一致的覆盖位集；计算之后选择被修改过时返回 None，需重新计算"""
+        if self.coverage_bits is None or self._coverage_key != self._selection_key():
+            return None
+        return self.coverage_bits
     
     def copy(self):
         """创建解的副本"""
@@ -114,8 +249,39 @@ class SensorSelectionSolution:
         new_solution.coverage_ratio = self.coverage_ratio
         new_solution.total_cost = self.total_cost
         new_solution.penalty = self.penalty
+        new_solution.coverage_bits = self.coverage_bits
+        new_solution._coverage_key = self._coverage_key
         return new_solution
 
+@dataclass
+class Population:
+    """
+    遗传算法的种群，按结构数组存放：每个字段的第 i 行对应第 i 个个体
+    
+    进化过程中的选择、交叉、变异和评估都直接在整列数组上进行，
+    只有最佳解才转换为 SensorSelectionSolution
+    """
+    selection: np.ndarray       # (P, 传感器数) uint8 选择位向量，卫星在前、地面传感器在后
+    coverage_bits: np.ndarray   # (P, n_words) uint64 覆盖位集
+    bits_known: np.ndarray      # (P,) bool，覆盖位集是否已知
+    fitness: np.ndarray         # (P,) 适应度
+    coverage_ratio: np.ndarray  # (P,) 覆盖率
+    total_cost: np.ndarray      # (P,) 总成本
+    penalty: np.ndarray         # (P,) 约束违反惩罚
+    
+    def __len__(self) -> int:
+        return len(self.selection)
+    
+    def take(self, index) -> 'Population':
+        """按下标（整数数组或切片）取出部分个体"""
+        return Population(**{f.name: getattr(self, f.name)[index] for f in fields(self)})
+    
+    @staticmethod
+    def concatenate(populations: List['Population']) -> 'Population':
+        """按顺序拼接多个种群"""
+        return Population(**{f.name: np.concatenate([getattr(p, f.name) for p in populations])
+                             for f in fields(Population)})
+
 class HybridSensorFromScratchOptimizer:
     """
     卫星+地面混合传感器从零布设优化器
@@ -133,212 +299,586 @@ class HybridSensorFromScratchOptimizer:
         # 生成目标区域网格点用于覆盖计算
         self._generate_grid_points()
         
+        # 传感器与网格点的覆盖关系在整个优化过程中不变，预先打包为 uint64 位集，
+        # 每个字存放 64 个网格点，评估方案时只需按位或后统计置位数
+        self.n_words = (len(self.xs) + 63) // 64
+        self._precompute_sensor_bits()
+        
+        # 候选传感器成本，方案总成本为选择位向量与成本向量的点积
+        self.sat_costs = np.array([sat.cost for sat in satellites], dtype=np.float64)
+        self.ground_costs = np.array([g.cost for g in ground_sensors], dtype=np.float64)
+        
+        # 选择位向量（字节串）-> 覆盖网格点数；精英复制和重复个体不再重新计算覆盖
+        self._coverage_cache: Dict[bytes, int] = {}
+        
     def _generate_grid_points(self):
         """生成目标区域的网格点"""
         minx, miny, maxx, maxy = self.target_area.bounds
         x_coords = np.arange(minx, maxx + self.grid_resolution, self.grid_resolution)
         y_coords = np.arange(miny, maxy + self.grid_resolution, self.grid_resolution)
         
-        self.grid_points = []
-        for x in x_coords:
-            for y in y_coords:
-                point = Point(x, y)
-                if self.target_area.contains(point) or self.target_area.touches(point):
-                    self.grid_points.append((x, y))
+        # 按列扫描线栅格化目标区域（含边界），按 x 优先保持原有顺序；
+        # 坐标按 x、y 分别存放为连续数组，供向量化覆盖计算使用
+        X, Y = np.meshgrid(x_coords, y_coords, indexing='ij')
+        inside = self._rasterize_target_area(x_coords, y_coords).ravel()
+        self.xs = np.ascontiguousarray(X.ravel()[inside])
+        self.ys = np.ascontiguousarray(Y.ravel()[inside])
+        self.grid_points = list(zip(self.xs.tolist(), self.ys.tolist()))
         
         print(f"目标区域网格点数量: {len(self.grid_points)}")
     
+    def _rasterize_target_area(self, x_coords: np.ndarray, y_coords: np.ndarray) -> np.ndarray:
+        """
+        扫描线栅格化：判断网格点是否落在目标区域内（含边界）
+        
+        每个 x 坐标作一条竖直扫描线，求出与区域各边（外环和内环）的交点并排序，
+        网格点下方的交点数为奇数即在区域内部。扫描线靠近顶点的整列、
+        以及距交点很近的网格点改用 shapely 精确判定，与 intersects 的结果一致
+        
+        返回:
+            (x 坐标数, y 坐标数) 的布尔数组
+        """
+        polygons = getattr(self.target_area, 'geoms', [self.target_area])
+        rings = [np.asarray(ring.coords) for polygon in polygons
+                 for ring in [polygon.exterior, *polygon.interiors]]
+        edges = np.concatenate([np.column_stack([ring[:-1], ring[1:]]) for ring in rings])
+        x0, y0, x1, y1 = edges.T
+        
+        minx, miny, maxx, maxy = self.target_area.bounds
+        tol = BOUNDARY_RTOL * max(1.0, abs(minx), abs(miny), abs(maxx), abs(maxy))
+        
+        inside = np.zeros((len(x_coords), len(y_coords)), dtype=bool)
+        exact = np.zeros_like(inside)
+        for i, x in enumerate(x_coords):
+            if np.any(np.abs(x0 - x) <= tol):
+                exact[i] = True
+                continue
+            
+            # 扫描线不经过顶点，与其相交的边两端点分列两侧
+            crossing = (x0 < x) != (x1 < x)
+            t = (x - x0[crossing]) / (x1[crossing] - x0[crossing])
+            cross_y = np.sort(y0[crossing] + t * (y1[crossing] - y0[crossing]))
+            if len(cross_y) == 0:
+                continue
+            
+            below = np.searchsorted(cross_y, y_coords, side='left')
+            inside[i] = below % 2 == 1
+            nearest = np.minimum(
+                np.abs(y_coords - cross_y[np.maximum(below - 1, 0)]),
+                np.abs(cross_y[np.minimum(below, len(cross_y) - 1)] - y_coords))
+            exact[i] = nearest <= tol
+        
+        col, row = np.nonzero(exact)
+        if len(col) > 0:
+            inside[col, row] = intersects_xy(self.target_area, x_coords[col], y_coords[row])
+        return inside
+    
     def calculate_coverage_ratio(self, solution: SensorSelectionSolution) -> float:
-        """计算解的覆盖率"""
+        """计算解的覆盖率，已知当前选择的覆盖位集时直接统计，不再重新求并"""
+        known_bits = solution.known_coverage_bits()
+        if known_bits is not None:
+            covered = int(popcount(known_bits))
+            return covered / len(self.xs)
+
         if not solution.selected_satellites and not solution.selected_ground_sensors:
             return 0.0
+
+        # 选择位向量与合并位集矩阵的行一一对应，一次取出所有选中行
+        selected = self._selection_vector(solution).view(bool)
+        covered = int(popcount(np.bitwise_or.reduce(self.sensor_bits[selected], axis=0)))
         
-        covered_points = set()
-        
-        # 计算卫星覆盖
-        for sat_id in solution.selected_satellites:
-            satellite = self.satellites[sat_id]
-            satellite_coverage = satellite.get_coverage_area()
-            for i, (x, y) in enumerate(self.grid_points):
-                if satellite_coverage.contains(Point(x, y)):
-                    covered_points.add(i)
-        
-        # 计算地面传感器覆盖
-        for sensor_id in solution.selected_ground_sensors:
-            sensor = self.ground_sensors[sensor_id]
-            sensor_point = Point(sensor.x, sensor.y)
-            for i, (x, y) in enumerate(self.grid_points):
-                if sensor_point.distance(Point(x, y)) <= sensor.radius:
-                    covered_points.add(i)
-        
-        coverage_ratio = len(covered_points) / len(self.grid_points)
+        coverage_ratio = covered / len(self.xs)
         return coverage_ratio
     
-    def calculate_total_cost(self, solution: SensorSelectionSolution) -> float:
-        """计算解的总成本"""
-        total_cost = 0.0
+    def _precompute_sensor_bits(self):
+        """计算每个候选传感器覆盖的网格点，打包为卫星在前、地面传感器在后的位集矩阵"""
+        rows, cols = [], []
         
-        for sat_id in solution.selected_satellites:
-            total_cost += self.satellites[sat_id].cost
+        # 网格点按 x 优先生成，每个传感器只需判断 x 落在其覆盖范围内的连续一段网格点；
+        # 卫星条带按轨道方向投影解析判断，只有边界附近的点才交给 shapely
+        for row, satellite in enumerate(self.satellites):
+            minx, _, maxx, _ = satellite.bounds()
+            grid_slice = self._grid_slice(minx, maxx)
+            covered = satellite.mask(self.xs[grid_slice], self.ys[grid_slice])
+            cols.append(grid_slice.start + np.flatnonzero(covered))
+            rows.append(np.full(len(cols[-1]), row))
         
-        for sensor_id in solution.selected_ground_sensors:
-            total_cost += self.ground_sensors[sensor_id].cost
+        # 地面传感器为圆形覆盖
+        for row, sensor in enumerate(self.ground_sensors, start=len(self.satellites)):
+            grid_slice = self._grid_slice(sensor.x - sensor.radius, sensor.x + sensor.radius)
+            covered = point_distance(self.xs[grid_slice], self.ys[grid_slice], sensor.x, sensor.y) <= sensor.radius
+            cols.append(grid_slice.start + np.flatnonzero(covered))
+            rows.append(np.full(len(cols[-1]), row))
         
-        return total_cost
+        n_sensors = len(self.satellites) + len(self.ground_sensors)
+        self.sensor_bits = pack_bits(n_sensors, self.n_words,
+                                     np.concatenate(rows or [np.empty(0, dtype=np.intp)]),
+                                     np.concatenate(cols or [np.empty(0, dtype=np.intp)]))
+        # sat_bits 与 ground_bits 是合并位集矩阵中的视图
+        self.sat_bits = self.sensor_bits[:len(self.satellites)]
+        self.ground_bits = self.sensor_bits[len(self.satellites):]
+    
+    def _grid_slice(self, minx: float, maxx: float) -> slice:
+        """x 坐标落在 [minx, maxx] 内的网格点区间，两端留出边界容差"""
+        pad = BOUNDARY_RTOL * max(1.0, abs(minx), abs(maxx))
+        lo = np.searchsorted(self.xs, minx - pad, side='left')
+        hi = np.searchsorted(self.xs, maxx + pad, side='right')
+        return slice(int(lo), int(hi))
+    
+    def _selection_vector(self, solution: SensorSelectionSolution) -> np.ndarray:
+        """由解的编号列表生成卫星在前、地面传感器在后的 uint8 选择位向量"""
+        selection = np.zeros(len(self.sensor_bits), dtype=np.uint8)
+        selection[np.asarray(solution.selected_satellites, dtype=np.intp)] = 1
+        selection[len(self.satellites) + np.asarray(solution.selected_ground_sensors, dtype=np.intp)] = 1
+        return selection
+    
+    def calculate_total_cost(self, solution: SensorSelectionSolution) -> float:
+        """计算解的总成本"""
+        selection = self._selection_vector(solution)
+        n_satellites = len(self.satellites)
+        return float(selection[:n_satellites] @ self.sat_costs + selection[n_satellites:] @ self.ground_costs)
     
     def evaluate_solution(self, solution: SensorSelectionSolution) -> float:
         """评估解的适应度"""
-        solution.coverage_ratio = self.calculate_coverage_ratio(solution)
-        solution.total_cost = self.calculate_total_cost(solution)
+        return float(self.evaluate_population([solution])[0])
+    
+    def evaluate_population(self, solutions: List[SensorSelectionSolution]) -> np.ndarray:
+        """
+        批量评估一组解的适应度，并写回各解的覆盖率、成本、惩罚和适应度
         
-        # 计算约束违反惩罚
-        penalty = 0.0
+        参数:
+            solutions: 待评估的解列表
+            
+        返回:
+            各解的适应度数组
+        """
+        selection = np.array([self._selection_vector(sol) for sol in solutions],
+                             dtype=np.uint8).reshape(-1, len(self.sensor_bits))
+        known = [sol.known_coverage_bits() for sol in solutions]
+        bits_known = np.array([bits is not None for bits in known], dtype=bool)
+        coverage_bits = np.zeros((len(solutions), self.n_words), dtype=np.uint64)
+        if bits_known.any():
+            coverage_bits[bits_known] = [bits for bits in known if bits is not None]
         
-        # 传感器数量约束
-        if len(solution.selected_satellites) > self.constraints.max_satellites:
-            penalty += (len(solution.selected_satellites) - self.constraints.max_satellites) * 50
+        population = self._evaluate_arrays(selection, coverage_bits, bits_known)
+        for i, solution in enumerate(solutions):
+            self._write_solution(population, i, solution)
+        return population.fitness
+    
+    def _evaluate_arrays(self, selection: np.ndarray, coverage_bits: np.ndarray,
+                         bits_known: np.ndarray) -> Population:
+        """
+        按选择位向量批量评估，返回评估后的种群
         
-        if len(solution.selected_ground_sensors) > self.constraints.max_ground_sensors:
-            penalty += (len(solution.selected_ground_sensors) - self.constraints.max_ground_sensors) * 10
+        覆盖位集已知的方案直接统计置位数，其余的查缓存或批量计算；
+        新算出的覆盖位集写回 coverage_bits 并在 bits_known 中标记（缓存命中的仍为未知）
+        """
+        n_satellites = len(self.satellites)
+        covered = np.zeros(len(selection), dtype=np.int64)
+        if bits_known.any():
+            covered[bits_known] = popcount(coverage_bits[bits_known])
+        unknown = np.flatnonzero(~bits_known)
+        if len(unknown) > 0:
+            covered[unknown], unions = self._cached_coverage(selection[unknown])
+            for i, union in zip(unknown, unions):
+                if union is not None:
+                    coverage_bits[i] = union
+                    bits_known[i] = True
+        coverage_ratio = covered / len(self.xs) if len(self.xs) else np.zeros(len(selection))
+        sat_masks = selection[:, :n_satellites]
+        ground_masks = selection[:, n_satellites:]
+        total_cost = sat_masks @ self.sat_costs + ground_masks @ self.ground_costs
         
-        # 成本约束
-        if solution.total_cost > self.constraints.max_total_cost:
-            penalty += (solution.total_cost - self.constraints.max_total_cost) * 2
+        # 计算约束违反惩罚：传感器数量约束和成本约束
+        num_satellites = np.count_nonzero(sat_masks, axis=1)
+        num_ground_sensors = np.count_nonzero(ground_masks, axis=1)
+        penalty = (np.maximum(num_satellites - self.constraints.max_satellites, 0) * 50
+                   + np.maximum(num_ground_sensors - self.constraints.max_ground_sensors, 0) * 10
+                   + np.maximum(total_cost - self.constraints.max_total_cost, 0) * 2)
         
-        solution.penalty = penalty
+        # 适应度计算：覆盖率为主要目标，成本为次要目标；
+        # 达到目标覆盖率后优化成本，未达到时主要优化覆盖率
+        fitness = np.where(coverage_ratio >= self.constraints.target_coverage_ratio,
+                           1000 + coverage_ratio * 500 - total_cost * 0.1 - penalty,
+                           coverage_ratio * 1000 - penalty)
         
-        # 适应度计算：覆盖率为主要目标，成本为次要目标
-        if solution.coverage_ratio >= self.constraints.target_coverage_ratio:
-            # 达到目标覆盖率，优化成本
-            fitness = 1000 + solution.coverage_ratio * 500 - solution.total_cost * 0.1 - penalty
-        else:
-            # 未达到目标覆盖率，主要优化覆盖率
-            fitness = solution.coverage_ratio * 1000 - penalty
+        return Population(selection, coverage_bits, bits_known, fitness, coverage_ratio,
+                          total_cost, penalty)
+    
+    def _write_solution(self, population: Population, index: int,
+                        solution: Optional[SensorSelectionSolution] = None) -> SensorSelectionSolution:
+        """将种群中第 index 个个体写入解对象（未给出时新建），返回该解"""
+        if solution is None:
+            solution = SensorSelectionSolution()
+        solution.selected_satellites = np.flatnonzero(population.selection[index, :len(self.satellites)]).tolist()
+        solution.selected_ground_sensors = np.flatnonzero(population.selection[index, len(self.satellites):]).tolist()
+        solution.coverage_ratio = float(population.coverage_ratio[index])
+        solution.total_cost = float(population.total_cost[index])
+        solution.penalty = float(population.penalty[index])
+        solution.fitness = float(population.fitness[index])
+        solution.set_coverage_bits(population.coverage_bits[index].copy() if population.bits_known[index] else None)
+        return solution
+    
+    def _cached_coverage(self, selection: np.ndarray) -> Tuple[np.ndarray, List[Optional[np.ndarray]]]:
+        """
+        按选择位向量查缓存得到各方案覆盖的网格点数，未命中的方案去重后批量计算
         
-        solution.fitness = fitness
-        return fitness
+        返回:
+            覆盖网格点数数组, 各方案的覆盖位集（缓存命中的方案为 None）
+        """
+        if len(self._coverage_cache) >= COVERAGE_CACHE_SIZE:
+            self._coverage_cache.clear()
+        
+        keys = [row.tobytes() for row in selection]
+        missing = {}
+        for i, key in enumerate(keys):
+            if key not in self._coverage_cache:
+                missing.setdefault(key, i)
+        
+        unions = [None] * len(keys)
+        if missing:
+            missing_unions, counts = self._population_coverage(selection[list(missing.values())])
+            self._coverage_cache.update(zip(missing, counts.tolist()))
+            for union, i in zip(missing_unions, missing.values()):
+                unions[i] = union
+        
+        counts = np.array([self._coverage_cache[key] for key in keys], dtype=np.int64)
+        return counts, unions
     
-    def optimize_genetic(self, population_size: int = 30, generations: int = 50) -> SensorSelectionSolution:
-        """使用遗传算法优化"""
+    def _population_coverage(self, selection: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        根据 (种群规模, 传感器数) 的选择位向量计算每个方案的覆盖位集
+        
+        返回:
+            (种群规模, n_words) 的覆盖位集, 各方案覆盖的网格点数
+        """
+        if self._use_kernel(len(selection)):
+            # 参数固定为 C 连续的 uint8 / uint64 二维数组，内核只有一种特化，始终命中磁盘缓存
+            return _population_coverage_kernel(np.ascontiguousarray(selection, dtype=np.uint8),
+                                               self.sensor_bits)
+        
+        # 未选中的传感器位集置零后按传感器维按位或
+        selected_bits = np.where(selection[:, :, None].view(bool), self.sensor_bits, np.uint64(0))
+        unions = np.bitwise_or.reduce(selected_bits, axis=1)
+        return unions, popcount(unions)
+    
+    def _use_kernel(self, n_solutions: int) -> bool:
+        """批量评估 n_solutions 个解时是否使用 Numba 内核"""
+        return NUMBA_AVAILABLE and n_solutions * len(self.sensor_bits) * self.n_words > NUMBA_MIN_WORK
+    
+    def optimize_genetic(self, population_size: int = 30, generations: int = 50,
+                         random_seed: int = None, n_islands: int = 1,
+                         migration_interval: int = 10, n_jobs: int = None) -> SensorSelectionSolution:
+        """
+        使用遗传算法优化
+        
+        参数:
+            population_size: 种群规模（多岛时为每个岛的种群规模）
+            generations: 进化代数
+            random_seed: 随机种子
+            n_islands: 岛屿数，大于 1 时采用岛屿模型，各岛独立进化并定期环形迁移最优个体
+            migration_interval: 岛屿模型两次迁移之间的进化代数
+            n_jobs: 岛屿模型的并行进程数，None 表示使用全部 CPU 核心，1 表示在当前进程中依次进化
+        """
+        if n_islands > 1:
+            return self._optimize_islands(population_size, generations, random_seed,
+                                          n_islands, migration_interval, n_jobs)
+        
+        # 本次规模会用到 Numba 内核时先行加载（有磁盘缓存时约 0.3 s，否则为编译时间），
+        # 不让首代评估和计时承担这部分延迟；小规模问题不会加载内核
+        if self._use_kernel(population_size):
+            _population_coverage_kernel(np.zeros((1, 1), dtype=np.uint8), self.sensor_bits[:1])
+        
         print("开始遗传算法优化...")
         start_time = time.time()
+        self._coverage_cache.clear()
+        rng = np.random.default_rng(random_seed)
         
-        # 初始化种群
-        population = []
-        for _ in range(population_size):
-            solution = SensorSelectionSolution()
-            
+        population = self._initial_population(population_size, rng)
+        best_solution = self._write_solution(population, int(np.argmax(population.fitness)))
+        print(f"初始种群最佳适应度: {best_solution.fitness:.2f}, 覆盖率: {best_solution.coverage_ratio*100:.1f}%")
+        
+        population, best_solution = self._evolve(population, generations, rng, best_solution)
+        
+        end_time = time.time()
+        print(f"遗传算法优化完成，耗时: {end_time - start_time:.2f} 秒")
+        self._report_solution(best_solution)
+        
+        return best_solution
+    
+    def _optimize_islands(self, population_size: int, generations: int, random_seed: Optional[int],
+                          n_islands: int, migration_interval: int,
+                          n_jobs: Optional[int]) -> SensorSelectionSolution:
+        """
+        岛屿模型遗传算法：各岛每进化 migration_interval 代为一轮，轮间将每个岛的最优个体
+        复制到下一个岛替换其最差个体
+        
+        各岛使用由 random_seed 派生的独立随机数生成器，并随种群在进程间传递，
+        结果与并行进程数无关。多进程时优化器只在每个工作进程启动时传入一次
+        """
+        print(f"开始岛屿模型遗传算法优化（{n_islands} 个岛）...")
+        start_time = time.time()
+        self._coverage_cache.clear()
+        rngs = [np.random.default_rng(seed) for seed in np.random.SeedSequence(random_seed).spawn(n_islands)]
+        islands = [self._initial_population(population_size, rng) for rng in rngs]
+        
+        initial = Population.concatenate(islands)
+        best_solution = self._write_solution(initial, int(np.argmax(initial.fitness)))
+        print(f"初始种群最佳适应度: {best_solution.fitness:.2f}, 覆盖率: {best_solution.coverage_ratio*100:.1f}%")
+        
+        n_migrants = max(1, population_size // 10)
+        n_jobs = min(n_jobs or os.cpu_count() or 1, n_islands)
+        # 工作进程各自运行 Python 层面的进化循环，Numba 内核在各进程内单线程运行，避免超额订阅；
+        # 使用 spawn 启动，不继承父进程中已初始化的 Numba 线程池
+        parallel = n_jobs > 1
+        with ProcessPoolExecutor(max_workers=n_jobs, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_island_worker,
+                                 initargs=(self,)) if parallel else nullcontext() as executor:
+            generation = 0
+            while generation < generations:
+                epoch = min(migration_interval, generations - generation)
+                tasks = [(island, rng, epoch, best_solution) for island, rng in zip(islands, rngs)]
+                if parallel:
+                    results = list(executor.map(_run_island, tasks))
+                else:
+                    results = [self._evolve_island(*task) for task in tasks]
+                islands = [result[0] for result in results]
+                rngs = [result[1] for result in results]
+                generation += epoch
+                
+                current_best = max((result[2] for result in results), key=lambda x: x.fitness)
+                if current_best.fitness > best_solution.fitness:
+                    best_solution = current_best.copy()
+                
+                # 环形迁移：第 i 个岛的最优个体替换第 i+1 个岛的最差个体
+                islands = [island.take(np.argsort(-island.fitness, kind='stable')) for island in islands]
+                islands = [Population.concatenate([island.take(slice(0, len(island) - n_migrants)),
+                                                   islands[i - 1].take(slice(0, n_migrants))])
+                           for i, island in enumerate(islands)]
+                
+                print(f"第 {generation} 代: 最佳适应度={best_solution.fitness:.2f}, "
+                      f"覆盖率={best_solution.coverage_ratio*100:.1f}%, "
+                      f"成本={best_solution.total_cost:.1f}")
+        
+        end_time = time.time()
+        print(f"岛屿模型遗传算法优化完成，耗时: {end_time - start_time:.2f} 秒")
+        self._report_solution(best_solution)
+        
+        return best_solution
+    
+    def _initial_population(self, population_size: int, rng: np.random.Generator) -> Population:
+        """随机生成并评估初始种群"""
+        n_satellites = len(self.satellites)
+        n_ground_sensors = len(self.ground_sensors)
+        selection = np.zeros((population_size, n_satellites + n_ground_sensors), dtype=np.uint8)
+        for row in selection:
             # 随机选择卫星
-            num_satellites = random.randint(0, min(len(self.satellites), self.constraints.max_satellites))
-            solution.selected_satellites = random.sample(range(len(self.satellites)), num_satellites)
+            num_satellites = rng.integers(0, min(n_satellites, self.constraints.max_satellites) + 1)
+            row[rng.choice(n_satellites, num_satellites, replace=False)] = 1
             
             # 随机选择地面传感器
-            num_ground_sensors = random.randint(0, min(len(self.ground_sensors), self.constraints.max_ground_sensors))
-            solution.selected_ground_sensors = random.sample(range(len(self.ground_sensors)), num_ground_sensors)
-            
-            self.evaluate_solution(solution)
-            population.append(solution)
+            num_ground_sensors = rng.integers(0, min(n_ground_sensors, self.constraints.max_ground_sensors) + 1)
+            row[n_satellites + rng.choice(n_ground_sensors, num_ground_sensors, replace=False)] = 1
         
-        best_solution = max(population, key=lambda x: x.fitness).copy()
-        print(f"初始种群最佳适应度: {best_solution.fitness:.2f}, 覆盖率: {best_solution.coverage_ratio*100:.1f}%")
+        # 以贪心最大覆盖解及其随机扰动替换种群末尾的个体，其余个体保持随机
+        n_perturbed = min(population_size // 10, population_size - 1)
+        seeded = np.repeat(self._greedy_selection()[None, :], n_perturbed + 1, axis=0)
+        self._mutate_population(seeded[1:], np.zeros((n_perturbed, self.n_words), dtype=np.uint64),
+                                np.zeros(n_perturbed, dtype=bool), rng.random((n_perturbed, 2, 3)),
+                                mutation_rate=1.0)
+        selection[population_size - len(seeded):] = seeded
         
-        # 进化过程
-        for generation in range(generations):
-            new_population = []
+        return self._evaluate_arrays(selection, np.zeros((population_size, self.n_words), dtype=np.uint64),
+                                     np.zeros(population_size, dtype=bool))
+    
+    def _greedy_selection(self) -> np.ndarray:
+        """
+        贪心最大覆盖：在数量和预算约束内，每次选择新增覆盖网格点最多的传感器，
+        直到达到目标覆盖率或没有传感器能增加覆盖
+        
+        返回:
+            卫星在前、地面传感器在后的选择位向量
+        """
+        n_satellites = len(self.satellites)
+        costs = np.concatenate([self.sat_costs, self.ground_costs])
+        is_satellite = np.arange(len(costs)) < n_satellites
+        selection = np.zeros(len(costs), dtype=np.uint8)
+        
+        total_points = len(self.xs)
+        uncovered = pack_bits(1, self.n_words, np.zeros(total_points, dtype=np.intp), np.arange(total_points))[0]
+        target = self.constraints.target_coverage_ratio * total_points
+        covered = 0
+        spent = 0.0
+        while covered < target:
+            feasible = (selection == 0) & (spent + costs <= self.constraints.max_total_cost)
+            if np.count_nonzero(selection[:n_satellites]) >= self.constraints.max_satellites:
+                feasible &= ~is_satellite
+            if np.count_nonzero(selection[n_satellites:]) >= self.constraints.max_ground_sensors:
+                feasible &= is_satellite
             
-            # 精英保留
+            gains = np.where(feasible, popcount(self.sensor_bits & uncovered), 0)
+            if not gains.any():
+                break
+            best = int(np.argmax(gains))
+            selection[best] = 1
+            uncovered &= ~self.sensor_bits[best]
+            covered += int(gains[best])
+            spent += costs[best]
+        return selection
+    
+    def _evolve(self, population: Population, generations: int, rng: np.random.Generator,
+                best_solution: SensorSelectionSolution,
+                verbose: bool = True) -> Tuple[Population, SensorSelectionSolution]:
+        """
+        将已评估的种群进化 generations 代
+        
+        返回:
+            (末代种群, 进化过程中的最佳解)
+        """
+        population_size = len(population)
+        for generation in range(generations):
+            # 精英保留（适应度相同的个体保持原有顺序）
             elite_size = max(1, population_size // 10)
-            elite = sorted(population, key=lambda x: x.fitness, reverse=True)[:elite_size]
-            new_population.extend([sol.copy() for sol in elite])
+            elite = population.take(np.argsort(-population.fitness, kind='stable')[:elite_size])
             
-            # 生成新个体
-            while len(new_population) < population_size:
-                parent1 = self._tournament_selection(population)
-                parent2 = self._tournament_selection(population)
-                
-                if random.random() < 0.8:  # 交叉概率
-                    child1, child2 = self._crossover(parent1, parent2)
-                else:
-                    child1, child2 = parent1.copy(), parent2.copy()
-                
-                self._mutate(child1)
-                self._mutate(child2)
-                
-                self.evaluate_solution(child1)
-                self.evaluate_solution(child2)
-                
-                new_population.extend([child1, child2])
+            # 一次锦标赛选出本代全部父代，两两配对生成新个体，整代子代生成后一次批量评估
+            n_pairs = (population_size - elite_size + 1) // 2
+            parents = self._tournament_selection(population.fitness, 2 * n_pairs, rng)
+            
+            # 本代交叉、变异所需的随机数一次批量生成：交叉判定、两类传感器的切分点，
+            # 以及每个子代两类传感器的变异判定、增删判定和选取位置
+            cross_draws = rng.random(n_pairs)
+            split_draws = rng.random((n_pairs, 2))
+            mutation_draws = rng.random((2 * n_pairs, 2, 3))
+            
+            # 发生交叉的配对由双亲按位生成两个子代，其余配对直接复制双亲（保留其覆盖位集）
+            crossed = np.repeat(cross_draws < 0.8, 2)  # 交叉概率
+            selection = population.selection[parents]
+            first, second = self._crossover(selection[0::2], selection[1::2], split_draws)
+            selection[0::2] = np.where(crossed[0::2, None], first, selection[0::2])
+            selection[1::2] = np.where(crossed[1::2, None], second, selection[1::2])
+            coverage_bits = population.coverage_bits[parents]
+            bits_known = population.bits_known[parents] & ~crossed
+            
+            self._mutate_population(selection, coverage_bits, bits_known, mutation_draws)
+            children = self._evaluate_arrays(selection, coverage_bits, bits_known)
             
             # 更新种群
-            population = new_population[:population_size]
+            population = Population.concatenate([elite, children]).take(slice(0, population_size))
             
             # 更新最佳解
-            current_best = max(population, key=lambda x: x.fitness)
-            if current_best.fitness > best_solution.fitness:
-                best_solution = current_best.copy()
+            current_best = int(np.argmax(population.fitness))
+            if population.fitness[current_best] > best_solution.fitness:
+                best_solution = self._write_solution(population, current_best)
             
-            if generation % 10 == 0:
+            if verbose and generation % 10 == 0:
                 print(f"第 {generation} 代: 最佳适应度={best_solution.fitness:.2f}, "
                       f"覆盖率={best_solution.coverage_ratio*100:.1f}%, "
                       f"成本={best_solution.total_cost:.1f}")
         
-        end_time = time.time()
-        print(f"遗传算法优化完成，耗时: {end_time - start_time:.2f} 秒")
-        print(f"最终结果: 覆盖率={best_solution.coverage_ratio*100:.2f}%, "
-              f"卫星数量={len(best_solution.selected_satellites)}, "
-              f"地面传感器数量={len(best_solution.selected_ground_sensors)}, "
-              f"总成本={best_solution.total_cost:.1f}")
+        return population, best_solution
+    
+    def _evolve_island(self, population: Population, rng: np.random.Generator, generations: int,
+                       best_solution: SensorSelectionSolution
+                       ) -> Tuple[Population, np.random.Generator, SensorSelectionSolution]:
+        """岛屿模型的一轮进化，返回 (末代种群, 随机数生成器, 本轮最佳解)，生成器随结果传回主进程"""
+        population, best_solution = self._evolve(population, generations, rng, best_solution, verbose=False)
+        return population, rng, best_solution
+    
+    @staticmethod
+    def _report_solution(solution: SensorSelectionSolution):
+        """输出优化结果摘要"""
+        print(f"最终结果: 覆盖率={solution.coverage_ratio*100:.2f}%, "
+              f"卫星数量={len(solution.selected_satellites)}, "
+              f"地面传感器数量={len(solution.selected_ground_sensors)}, "
+              f"总成本={solution.total_cost:.1f}")
+    
+    @staticmethod
+    def _tournament_selection(fitness: np.ndarray, n_winners: int, rng: np.random.Generator,
+                              tournament_size: int = 3) -> np.ndarray:
+        """
+        锦标赛选择：一次抽取全部锦标赛的参赛个体，返回各场胜者在种群中的下标
         
-        return best_solution
+        参数:
+            fitness: 种群适应度
+            n_winners: 锦标赛场数
+            rng: 随机数生成器
+            tournament_size: 每场参赛个体数
+        """
+        contestants = rng.integers(0, len(fitness), (n_winners, tournament_size))
+        return contestants[np.arange(n_winners), fitness[contestants].argmax(axis=1)]
+    
+    def _crossover(self, selection1: np.ndarray, selection2: np.ndarray,
+                   split_draws: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        交叉操作：双亲选中的传感器取并集，按随机切分点分给两个子代
+        
+        并集中按编号排在切分点之前的传感器归第一个子代，其余归第二个子代。
+        切分直接在位向量上完成：并集的前缀和即各选中传感器在并集中的序号
+        
+        参数:
+            selection1, selection2: 双亲的选择位向量（卫星在前、地面传感器在后），可按行批量给出
+            split_draws: 卫星、地面传感器切分点对应的 [0, 1) 均匀随机数，最后一维长度为 2
+            
+        返回:
+            两个子代的选择位向量
+        """
+        union = selection1 | selection2
+        first = np.zeros_like(union)
+        n_satellites = len(self.satellites)
+        for part, draws in ((slice(None, n_satellites), split_draws[..., 0]),
+                            (slice(n_satellites, None), split_draws[..., 1])):
+            rank = np.cumsum(union[..., part], axis=-1, dtype=np.int64)
+            count = np.count_nonzero(union[..., part], axis=-1)
+            split_point = (draws * (count + 1)).astype(np.int64)
+            first[..., part] = union[..., part] & (rank <= split_point[..., None])
+        return first, union ^ first
     
-    def _tournament_selection(self, population: List[SensorSelectionSolution], tournament_size: int = 3) -> SensorSelectionSolution:
-        """锦标赛选择"""
-        tournament = random.sample(population, min(tournament_size, len(population)))
-        return max(tournament, key=lambda x: x.fitness)
-    
-    def _crossover(self, parent1: SensorSelectionSolution, parent2: SensorSelectionSolution) -> Tuple[SensorSelectionSolution, SensorSelectionSolution]:
-        """交叉操作"""
-        child1, child2 = SensorSelectionSolution(), SensorSelectionSolution()
-        
-        # 卫星交叉
-        all_satellites = list(set(parent1.selected_satellites + parent2.selected_satellites))
-        if all_satellites:
-            split_point = random.randint(0, len(all_satellites))
-            child1.selected_satellites = all_satellites[:split_point]
-            child2.selected_satellites = all_satellites[split_point:]
-        
-        # 地面传感器交叉
-        all_ground_sensors = list(set(parent1.selected_ground_sensors + parent2.selected_ground_sensors))
-        if all_ground_sensors:
-            split_point = random.randint(0, len(all_ground_sensors))
-            child1.selected_ground_sensors = all_ground_sensors[:split_point]
-            child2.selected_ground_sensors = all_ground_sensors[split_point:]
-        
-        return child1, child2
-    
-    def _mutate(self, solution: SensorSelectionSolution, mutation_rate: float = 0.1):
-        """变异操作"""
-        # 卫星变异
-        if random.random() < mutation_rate:
-            if solution.selected_satellites and random.random() < 0.5:
-                # 移除一个卫星
-                solution.selected_satellites.remove(random.choice(solution.selected_satellites))
-            else:
-                # 添加一个卫星
-                available = [i for i in range(len(self.satellites)) if i not in solution.selected_satellites]
-                if available and len(solution.selected_satellites) < self.constraints.max_satellites:
-                    solution.selected_satellites.append(random.choice(available))
-        
-        # 地面传感器变异
-        if random.random() < mutation_rate:
-            if solution.selected_ground_sensors and random.random() < 0.5:
-                # 移除一个传感器
-                solution.selected_ground_sensors.remove(random.choice(solution.selected_ground_sensors))
-            else:
-                # 添加一个传感器
-                available = [i for i in range(len(self.ground_sensors)) if i not in solution.selected_ground_sensors]
-                if available and len(solution.selected_ground_sensors) < self.constraints.max_ground_sensors:
-                    solution.selected_ground_sensors.append(random.choice(available))
+    def _mutate_population(self, selection: np.ndarray, coverage_bits: np.ndarray, bits_known: np.ndarray,
+                           draws: np.ndarray, mutation_rate: float = 0.1):
+        """
+        变异操作：每个个体的卫星和地面传感器各以给定概率随机移除一个已选传感器，
+        或在数量上限内随机添加一个未选传感器；原地修改选择位向量
+        
+        已知的覆盖位集随之更新：添加时与该传感器的位集按位或，移除时对剩余选中传感器重新求并
+        
+        参数:
+            selection: (n, 传感器数) 选择位向量
+            coverage_bits, bits_known: 各个体的覆盖位集及其是否已知
+            draws: (n, 2, 3) 的 [0, 1) 均匀随机数，两行分别用于卫星和地面传感器，
+                   依次为变异判定、增删判定和选取位置
+        """
+        n_satellites = len(self.satellites)
+        removed = np.zeros(len(selection), dtype=bool)
+        for k, (part, max_selected) in enumerate(
+                ((slice(0, n_satellites), self.constraints.max_satellites),
+                 (slice(n_satellites, len(self.sensor_bits)), self.constraints.max_ground_sensors))):
+            masks = selection[:, part]
+            if masks.shape[1] == 0:
+                continue
+            trigger, remove, pick = draws[:, k].T
+            n_selected = np.count_nonzero(masks, axis=1)
+            n_available = masks.shape[1] - n_selected
+            
+            mutate = trigger < mutation_rate
+            do_remove = mutate & (n_selected > 0) & (remove < 0.5)
+            do_add = mutate & ~do_remove & (n_available > 0) & (n_selected < max_selected)
+            
+            # 选取第 int(pick * 数量) 个已选（移除时）或未选（添加时）传感器，按前缀和定位其编号
+            rank = np.where(do_remove, pick * n_selected, pick * n_available).astype(np.int64)
+            candidates = np.where(do_remove[:, None], masks, 1 - masks)
+            index = np.argmax(np.cumsum(candidates, axis=1) > rank[:, None], axis=1)
+            
+            changed = np.flatnonzero(do_remove | do_add)
+            masks[changed, index[changed]] = do_add[changed]
+            
+            added = np.flatnonzero(do_add & bits_known)
+            coverage_bits[added] |= self.sensor_bits[part][index[added]]
+            removed |= do_remove
+        
+        recompute = np.flatnonzero(removed & bits_known)
+        if len(recompute) > 0:
+            coverage_bits[recompute] = self._population_coverage(selection[recompute])[0]
     
     def visualize_solution(self, solution: SensorSelectionSolution, title: str = "混合传感器网络配置"):
         """可视化解决方案"""
@@ -350,59 +890,46 @@ class HybridSensorFromScratchOptimizer:
             ax.plot(x, y, 'b-', linewidth=2, label='目标区域边界')
             ax.fill(x, y, alpha=0.2, color='lightblue', label='目标区域')
         
-        # 绘制选中的卫星覆盖区域（条带状）
-        for sat_id in solution.selected_satellites:
-            satellite = self.satellites[sat_id]
-            
-            # 获取条带多边形
-            swath_polygon = satellite.get_coverage_area()
+        # 绘制选中的卫星：条带覆盖区域、轨道线和起止点各合并为一个集合对象
+        satellites = [self.satellites[i] for i in solution.selected_satellites]
+        if satellites:
+            strips = [np.asarray(sat.get_coverage_area().exterior.coords) for sat in satellites]
+            ax.add_collection(PolyCollection(strips, facecolor=to_rgba('red', 0.3),
+                                             edgecolor=to_rgba('red', 0.3), linewidth=2))
             
-            # 绘制条带覆盖区域
-            if swath_polygon.geom_type == 'Polygon':
-                x_coords, y_coords = swath_polygon.exterior.xy
-                swath_patch = patches.Polygon(
-                    list(zip(x_coords, y_coords)),
-                    linewidth=2, edgecolor='red', facecolor='red', alpha=0.3
-                )
-                ax.add_patch(swath_patch)
-            
-            # 绘制卫星轨道线
-            ax.plot([satellite.start_x, satellite.end_x], 
-                   [satellite.start_y, satellite.end_y], 
-                   'r-', linewidth=3, alpha=0.8, label='卫星轨道' if sat_id == solution.selected_satellites[0] else "")
+            tracks = [[(sat.start_x, sat.start_y), (sat.end_x, sat.end_y)] for sat in satellites]
+            ax.add_collection(LineCollection(tracks, colors=to_rgba('red', 0.8), linewidths=3))
             
             # 标注卫星起点和终点
-            ax.scatter(satellite.start_x, satellite.start_y, c='red', s=80, 
-                      marker='o', edgecolors='black', linewidth=1, zorder=5)
-            ax.scatter(satellite.end_x, satellite.end_y, c='red', s=80, 
-                      marker='s', edgecolors='black', linewidth=1, zorder=5)
+            ax.scatter([sat.start_x for sat in satellites], [sat.start_y for sat in satellites],
+                       c='red', s=80, marker='o', edgecolors='black', linewidth=1, zorder=5)
+            ax.scatter([sat.end_x for sat in satellites], [sat.end_y for sat in satellites],
+                       c='red', s=80, marker='s', edgecolors='black', linewidth=1, zorder=5)
             
             # 标注卫星ID
-            center_x = (satellite.start_x + satellite.end_x) / 2
-            center_y = (satellite.start_y + satellite.end_y) / 2
-            ax.annotate(f'S{satellite.id}', 
-                       (center_x, center_y), 
-                       xytext=(5, 5), textcoords='offset points',
-                       bbox=dict(boxstyle='round,pad=0.3', facecolor='red', alpha=0.7))
-        
-        # 绘制选中的地面传感器覆盖区域
-        for sensor_id in solution.selected_ground_sensors:
-            sensor = self.ground_sensors[sensor_id]
-            circle = plt.Circle((sensor.x, sensor.y), sensor.radius, 
-                              fill=True, color='green', alpha=0.3)
-            ax.add_patch(circle)
-            
-            circle_outline = plt.Circle((sensor.x, sensor.y), sensor.radius, 
-                                      fill=False, color='green', linewidth=2)
-            ax.add_patch(circle_outline)
+            for satellite in satellites:
+                center_x = (satellite.start_x + satellite.end_x) / 2
+                center_y = (satellite.start_y + satellite.end_y) / 2
+                ax.annotate(f'S{satellite.id}', 
+                           (center_x, center_y), 
+                           xytext=(5, 5), textcoords='offset points',
+                           bbox=dict(boxstyle='round,pad=0.3', facecolor='red', alpha=0.7))
+        
+        # 绘制选中的地面传感器：覆盖圆合并为一个集合对象，半透明填充、实线轮廓
+        ground_sensors = [self.ground_sensors[i] for i in solution.selected_ground_sensors]
+        if ground_sensors:
+            circles = [Circle((sensor.x, sensor.y), sensor.radius) for sensor in ground_sensors]
+            ax.add_collection(PatchCollection(circles, facecolor=to_rgba('green', 0.3),
+                                              edgecolor='green', linewidth=2))
             
             # 标注传感器
-            ax.scatter(sensor.x, sensor.y, c='green', s=80, 
-                      marker='o', edgecolors='black', linewidth=1, zorder=5)
-            ax.annotate(f'G{sensor.id}', 
-                       (sensor.x, sensor.y), 
-                       xytext=(5, 5), textcoords='offset points',
-                       bbox=dict(boxstyle='round,pad=0.3', facecolor='green', alpha=0.7))
+            ax.scatter([sensor.x for sensor in ground_sensors], [sensor.y for sensor in ground_sensors],
+                       c='green', s=80, marker='o', edgecolors='black', linewidth=1, zorder=5)
+            for sensor in ground_sensors:
+                ax.annotate(f'G{sensor.id}', 
+                           (sensor.x, sensor.y), 
+                           xytext=(5, 5), textcoords='offset points',
+                           bbox=dict(boxstyle='round,pad=0.3', facecolor='green', alpha=0.7))
         
         # 设置图形属性
         ax.set_xlabel('X 坐标', fontsize=12)
@@ -432,6 +959,23 @@ class HybridSensorFromScratchOptimizer:
         plt.show()
 
 
+# 岛屿模型工作进程中的优化器，由进程池初始化函数设置一次，各轮任务只传递种群
+_island_optimizer: Optional[HybridSensorFromScratchOptimizer] = None
+
+
+def _init_island_worker(optimizer: HybridSensorFromScratchOptimizer):
+    """岛屿模型工作进程初始化：保存优化器，并将 Numba 内核限制为单线程"""
+    global _island_optimizer
+    _island_optimizer = optimizer
+    if NUMBA_AVAILABLE:
+        set_num_threads(1)
+
+
+def _run_island(task):
+    """在工作进程中执行一个岛的一轮进化"""
+    return _island_optimizer._evolve_island(*task)
+
+
 def demo_hybrid_sensor_from_scratch():
     """演示卫星+地面混合传感器从零布设"""
     print("="*60)
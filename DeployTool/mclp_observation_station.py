@@ -13,15 +13,73 @@
 
 """
 
+import heapq
+import math
+import os
 import numpy as np
 import matplotlib.pyplot as plt
-from shapely.geometry import Polygon, Point, MultiPolygon
-from shapely.ops import unary_union
+from shapely.geometry import Polygon, MultiPolygon
 import geopandas as gpd
+from scipy.spatial import cKDTree
 from typing import List, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
 import warnings
 warnings.filterwarnings('ignore')
 
+from geometry_utils import (KDTREE_RADIUS_SLACK, area_grid, contains_xy, distance_xy, intersects_xy,
+                            lattice, pack_bits, point_distance, popcount, prepare, union_and_unique)
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# 估算实际覆盖面积时，每个网格单元在 x、y 方向上各细分的份数
+COVERAGE_SUBDIVISION = 4
+
+# 观测站数 × 网格点数超过该值时使用 Numba 内核评估布局覆盖率
+NUMBA_MIN_WORK = 1 << 16
+
+# 未安装 Numba 时，候选位集矩阵的 uint64 字数超过该值才按候选分块在线程池中并行评估
+PARALLEL_MIN_WORDS = 1 << 20
+
+if NUMBA_AVAILABLE:
+    # 距离与 point_distance 的公式相同，不启用 fastmath
+    @njit(parallel=True, cache=True)
+    def _coverage_kernel(grid_x, grid_y, stations, radius):
+        """统计被至少一个观测站覆盖的网格点数量"""
+        count = 0
+        for g in prange(grid_x.shape[0]):
+            for s in range(stations.shape[0]):
+                dx = grid_x[g] - stations[s, 0]
+                dy = grid_y[g] - stations[s, 1]
+                if np.sqrt(dx * dx + dy * dy) <= radius:
+                    count += 1
+                    break
+        return count
+    
+    @njit(parallel=True, cache=True)
+    def _union_count_kernel(candidate_bits, base_bits):
+        """并行统计各候选位集与基础位集并集的置位数，不生成 (候选数, 字数) 临时数组"""
+        m1 = np.uint64(0x5555555555555555)
+        m2 = np.uint64(0x3333333333333333)
+        m4 = np.uint64(0x0f0f0f0f0f0f0f0f)
+        h01 = np.uint64(0x0101010101010101)
+        one, two, four, top = np.uint64(1), np.uint64(2), np.uint64(4), np.uint64(56)
+        counts = np.zeros(candidate_bits.shape[0], dtype=np.int64)
+        for c in prange(candidate_bits.shape[0]):
+            total = 0
+            for w in range(candidate_bits.shape[1]):
+                # SWAR 方式统计 64 位字的置位数
+                x = candidate_bits[c, w] | base_bits[w]
+                x = x - ((x >> one) & m1)
+                x = (x & m2) + ((x >> two) & m2)
+                x = (x + (x >> four)) & m4
+                total += np.int64((x * h01) >> top)
+            counts[c] = total
+        return counts
+
 plt.rcParams['font.sans-serif'] = ['SimHei']  # 用来正常显示中文标签
 plt.rcParams['axes.unicode_minus'] = False    # 用来正常显示负号
 
@@ -51,36 +109,51 @@ class MCLPObservationStationSolver:
         
         # 创建目标区域的多边形
         self.target_area = Polygon(target_area_coords)
-        
-        # 网格点和相关数据
-        self.grid_points = []
-        self.grid_weights = []
-        self.covered_points = set()
+        # 预处理一次目标区域，向量化点包含判断复用其空间索引
+        prepare(self.target_area)
+        
+        # 网格点和相关数据，网格点为按列存储的 (N, 2) 坐标数组，grid_x / grid_y 是其连续的列视图
+        self.grid_points = np.empty((0, 2), dtype=np.float64, order='F')
+        self.grid_x = self.grid_points[:, 0]
+        self.grid_y = self.grid_points[:, 1]
+        self.grid_weights = np.empty(0, dtype=np.float64)
+        # 各网格点是否已被覆盖
+        self.covered_mask = np.zeros(0, dtype=bool)
         self.station_locations = []
         
         # 初始化网格
         self._initialize_grid()
+        # 网格点KD树，用于查询观测站半径范围内的网格点
+        self.tree = cKDTree(self.grid_points)
         
-    def _initialize_grid(self):
-        """初始化目标区域的网格点"""
-        # 获取区域边界
-        minx, miny, maxx, maxy = self.target_area.bounds
+        # 覆盖位集每个 uint64 字存放 64 个网格点，第 i 个网格点对应第 i 位
+        self.n_words = (len(self.grid_points) + 63) // 64
         
-        # 生成网格点
-        x_coords = np.arange(minx, maxx + self.grid_resolution, self.grid_resolution)
-        y_coords = np.arange(miny, maxy + self.grid_resolution, self.grid_resolution)
+        # 候选位置及其覆盖位集只取决于区域与观测半径，按观测半径缓存 (半径, 候选位置, 位集矩阵)
+        self._candidate_cache = None
         
-        for x in x_coords:
-            for y in y_coords:
-                point = Point(x, y)
-                if self.target_area.contains(point) or self.target_area.touches(point):
-                    self.grid_points.append((x, y))
-                    # 每个网格点的权重（可以根据实际需求调整）
-                    self.grid_weights.append(1.0)
+    def _initialize_grid(self):
+        """初始化目标区域的网格点"""
+        self.grid_points = np.asfortranarray(np.column_stack(area_grid(self.target_area, self.grid_resolution)))
+        self.grid_x = self.grid_points[:, 0]
+        self.grid_y = self.grid_points[:, 1]
+        # 每个网格点的权重（可以根据实际需求调整）
+        self.grid_weights = np.ones(len(self.grid_points))
+        self.covered_mask = np.zeros(len(self.grid_points), dtype=bool)
         
         print(f"网格初始化完成，共生成 {len(self.grid_points)} 个网格点")
         
-    def _calculate_coverage_for_position(self, station_pos: Tuple[float, float]) -> set:
+    @property
+    def covered_points(self) -> np.ndarray:
+        """被覆盖的网格点索引（升序），由 covered_mask 导出"""
+        return np.flatnonzero(self.covered_mask)
+    
+    @covered_points.setter
+    def covered_points(self, indices):
+        self.covered_mask = np.zeros(len(self.grid_points), dtype=bool)
+        self.covered_mask[np.fromiter(indices, dtype=np.intp)] = True
+    
+    def _calculate_coverage_for_position(self, station_pos: Tuple[float, float]) -> np.ndarray:
         """
         计算在指定位置放置观测站能覆盖的网格点
         
@@ -88,43 +161,94 @@ class MCLPObservationStationSolver:
             station_pos: 观测站位置 (x, y)
             
         返回:
-            被覆盖的网格点索引集合
+            新覆盖（此前未被覆盖）的网格点索引数组
         """
-        covered_indices = set()
-        station_point = Point(station_pos)
+        idx = self._within_radius(station_pos, self.tree.query_ball_point(
+            station_pos, self.sensor_radius * (1 + KDTREE_RADIUS_SLACK), return_sorted=True))
         
-        for i, grid_point in enumerate(self.grid_points):
-            if i not in self.covered_points:  # 只考虑未被覆盖的点
-                grid_point_geom = Point(grid_point)
-                if station_point.distance(grid_point_geom) <= self.sensor_radius:
-                    covered_indices.add(i)
-                    
-        return covered_indices
+        # 只考虑未被覆盖的点
+        return idx[~self.covered_mask[idx]]
+    
+    def _within_radius(self, station_pos, indices) -> np.ndarray:
+        """
+        从KD树查询得到的网格点索引中筛选出真正落在观测半径内的点
+        """
+        idx = np.asarray(indices, dtype=np.intp)
+        distance = point_distance(self.grid_x[idx], self.grid_y[idx], station_pos[0], station_pos[1])
+        return idx[distance <= self.sensor_radius]
     
-    def _get_candidate_positions(self) -> List[Tuple[float, float]]:
+    def _positions_to_bits(self, positions) -> np.ndarray:
         """
-        生成候选观测站位置
+        计算各位置覆盖的网格点并打包为 (n, n_words) 的 uint64 位集
         
-        这里使用网格点作为候选位置，实际应用中可以使用更复杂的策略
+        用位置KD树与网格点KD树做一次双树查询得到全部候选 (位置, 网格点) 对，再精确筛选
         """
-        # 可以使用网格点作为候选位置
-        candidates = []
-        minx, miny, maxx, maxy = self.target_area.bounds
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        if len(positions) == 0 or len(self.grid_points) == 0:
+            return np.zeros((len(positions), self.n_words), dtype=np.uint64)
+        
+        pairs = cKDTree(positions).sparse_distance_matrix(
+            self.tree, self.sensor_radius * (1 + KDTREE_RADIUS_SLACK), output_type='ndarray')
+        rows = pairs['i'].astype(np.intp)
+        cols = pairs['j'].astype(np.intp)
+        within = point_distance(self.grid_x[cols], self.grid_y[cols],
+                                positions[rows, 0], positions[rows, 1]) <= self.sensor_radius
+        return pack_bits(len(positions), self.n_words, rows[within], cols[within])
+    
+    def _layout_bits(self, stations) -> np.ndarray:
+        """计算布局中全部观测站覆盖位集的并集，返回长度为 n_words 的 uint64 数组"""
+        return np.bitwise_or.reduce(self._positions_to_bits(stations), axis=0)
+    
+    def _bits_to_mask(self, bits: np.ndarray) -> np.ndarray:
+        """将覆盖位集展开为每个网格点一个元素的布尔数组"""
+        return np.unpackbits(bits.view(np.uint8), bitorder='little')[:len(self.grid_points)].view(bool)
+    
+    @staticmethod
+    def _union_counts(base_bits: np.ndarray, candidate_bits: np.ndarray) -> np.ndarray:
+        """统计 base_bits 分别与各候选位集并集的置位数"""
+        if NUMBA_AVAILABLE:
+            return _union_count_kernel(candidate_bits, base_bits)
+        
+        n_jobs = os.cpu_count() or 1
+        if n_jobs == 1 or candidate_bits.size < PARALLEL_MIN_WORDS:
+            return popcount(base_bits | candidate_bits)
+        
+        # NumPy 按位运算与求和期间释放 GIL，各线程处理一段候选
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            chunks = executor.map(lambda chunk: popcount(base_bits | chunk),
+                                  np.array_split(candidate_bits, n_jobs))
+            return np.concatenate(list(chunks))
+    
+    def _get_candidate_positions(self) -> np.ndarray:
+        """
+        生成候选观测站位置，返回 (C, 2) 坐标数组
         
+        这里使用网格点作为候选位置，实际应用中可以使用更复杂的策略
+        """
         # 生成候选位置网格（可以比目标区域网格更稀疏）
         candidate_resolution = self.grid_resolution * 2  # 候选位置网格更稀疏
-        x_coords = np.arange(minx, maxx + candidate_resolution, candidate_resolution)
-        y_coords = np.arange(miny, maxy + candidate_resolution, candidate_resolution)
-        
-        for x in x_coords:
-            for y in y_coords:
-                point = Point(x, y)
-                # 候选位置可以在区域内或边界附近
-                if (self.target_area.contains(point) or 
-                    self.target_area.distance(point) <= self.sensor_radius):
-                    candidates.append((x, y))
-                    
-        return candidates
+        xs, ys = lattice(self.target_area.bounds, candidate_resolution)
+        
+        # 候选位置可以在区域内或边界附近（距区域不超过观测半径）。缓冲多边形内接于
+        # 真实的半径范围，其中的点必然满足；略放大的缓冲区与其之间的窄带内的点再按到区域的精确距离判断
+        mask = intersects_xy(self.target_area.buffer(self.sensor_radius), xs, ys)
+        band = np.flatnonzero(~mask & intersects_xy(
+            self.target_area.buffer(self.sensor_radius * (1 + 1e-2)), xs, ys))
+        mask[band] = distance_xy(self.target_area, xs[band], ys[band]) <= self.sensor_radius
+        
+        return np.column_stack([xs[mask], ys[mask]])
+    
+    def _candidate_coverage(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        返回候选位置 (C, 2) 及其覆盖位集矩阵 (C, n_words)
+        
+        首次调用时生成并缓存，之后的求解与优化直接复用；观测半径改变时重新生成。调用方不得修改返回的数组
+        """
+        if self._candidate_cache is None or self._candidate_cache[0] != self.sensor_radius:
+            candidate_positions = self._get_candidate_positions()
+            self._candidate_cache = (self.sensor_radius, candidate_positions,
+                                     self._positions_to_bits(candidate_positions))
+        return self._candidate_cache[1], self._candidate_cache[2]
     
     def solve(self) -> Tuple[List[Tuple[float, float]], int, float]:
         """
@@ -141,44 +265,53 @@ class MCLPObservationStationSolver:
         print(f"目标区域总网格点数: {total_points}")
         print(f"要求覆盖点数: {required_coverage} (覆盖率: {self.coverage_ratio*100:.1f}%)")
         
-        # 获取候选位置
-        candidate_positions = self._get_candidate_positions()
+        # 获取候选位置，候选位置与网格点的覆盖关系在求解过程中不变，使用缓存的位集矩阵
+        candidate_positions, candidate_bits = self._candidate_coverage()
         print(f"候选观测站位置数: {len(candidate_positions)}")
         
+        covered_bits = np.zeros(self.n_words, dtype=np.uint64)
+        gains = popcount(candidate_bits)
+        
+        # 延迟贪心（CELF）：新增覆盖只会随已覆盖点增多而减少，堆中记录的旧增益是上界，
+        # 每轮只需重新计算堆顶候选；按 (-增益, 序号) 排序，与逐个比较取第一个最大者的结果一致
+        heap = [(-int(gain), c) for c, gain in enumerate(gains) if gain > 0]
+        heapq.heapify(heap)
+        
         self.station_locations = []
-        self.covered_points = set()
+        covered_count = 0
         iteration = 0
         
-        while len(self.covered_points) < required_coverage:
+        while covered_count < required_coverage:
             iteration += 1
-            best_position = None
-            best_new_coverage = 0
-            best_covered_set = set()
             
-            # 评估每个候选位置
-            for pos in candidate_positions:
-                new_coverage = self._calculate_coverage_for_position(pos)
-                new_coverage_count = len(new_coverage)
-                
-                if new_coverage_count > best_new_coverage:
-                    best_new_coverage = new_coverage_count
-                    best_position = pos
-                    best_covered_set = new_coverage
+            best = -1
+            while heap:
+                _, c = heapq.heappop(heap)
+                gain = int(popcount(candidate_bits[c] & ~covered_bits))
+                if gain == 0:
+                    continue
+                if not heap or (-gain, c) <= heap[0]:
+                    best, best_new_coverage = c, gain
+                    break
+                heapq.heappush(heap, (-gain, c))
             
-            if best_position is None or best_new_coverage == 0:
+            if best < 0:
                 print("警告: 无法找到更多有效的观测站位置")
                 break
-                
+            best_position = tuple(candidate_positions[best].tolist())
+            
             # 添加最佳位置
             self.station_locations.append(best_position)
-            self.covered_points.update(best_covered_set)
+            covered_bits |= candidate_bits[best]
+            covered_count += best_new_coverage
             
-            current_coverage_ratio = len(self.covered_points) / total_points
+            current_coverage_ratio = covered_count / total_points
             print(f"第 {iteration} 个观测站: {best_position}, "
                   f"新增覆盖: {best_new_coverage} 点, "
                   f"总覆盖率: {current_coverage_ratio*100:.2f}%")
         
-        final_coverage_ratio = len(self.covered_points) / total_points
+        self.covered_mask = self._bits_to_mask(covered_bits)
+        final_coverage_ratio = covered_count / total_points
         print(f"\n求解完成!")
         print(f"观测站数量: {len(self.station_locations)}")
         print(f"最终覆盖率: {final_coverage_ratio*100:.2f}%")
@@ -204,8 +337,7 @@ class MCLPObservationStationSolver:
         
         # 绘制网格点（如果需要）
         if show_grid:
-            grid_x, grid_y = zip(*self.grid_points)
-            ax.scatter(grid_x, grid_y, c='lightgray', s=1, alpha=0.5, label='网格点')
+            ax.scatter(self.grid_x, self.grid_y, c='lightgray', s=1, alpha=0.5, label='网格点')
         
         # 绘制观测站覆盖范围
         for i, station in enumerate(self.station_locations):
@@ -237,7 +369,7 @@ class MCLPObservationStationSolver:
         ax.set_title(f'地面观测站布设方案\n'
                     f'观测站数量: {len(self.station_locations)}, '
                     f'覆盖半径: {self.sensor_radius}, '
-                    f'覆盖率: {len(self.covered_points)/len(self.grid_points)*100:.1f}%', 
+                    f'覆盖率: {np.count_nonzero(self.covered_mask)/len(self.grid_points)*100:.1f}%', 
                     fontsize=14, fontweight='bold')
         ax.legend(loc='upper right')
         ax.grid(True, alpha=0.3)
@@ -265,13 +397,13 @@ class MCLPObservationStationSolver:
             包含各种统计信息的字典
         """
         total_points = len(self.grid_points)
-        covered_points_count = len(self.covered_points)
+        covered_points_count = int(np.count_nonzero(self.covered_mask))
         coverage_ratio = covered_points_count / total_points if total_points > 0 else 0
         
         # 计算总覆盖面积（近似）- 基于网格点，避免重叠计算
         covered_area_grid = covered_points_count * (self.grid_resolution ** 2)
         
-        # 计算实际几何覆盖面积（精确计算，自动处理重叠）
+        # 在细分网格上估算实际覆盖面积（按单元计数，重叠只计一次）
         actual_covered_area = self._calculate_actual_coverage_area()
         
         total_area = self.target_area.area
@@ -285,48 +417,53 @@ class MCLPObservationStationSolver:
             '观测半径': self.sensor_radius,
             '目标区域面积': f"{total_area:.2f}",
             '覆盖面积估算(网格)': f"{covered_area_grid:.2f}",
-            '实际覆盖面积(几何)': f"{actual_covered_area:.2f}",
+            '实际覆盖面积(细分网格)': f"{actual_covered_area:.2f}",
             '实际面积覆盖率': f"{(actual_covered_area/total_area)*100:.2f}%",
             '网格分辨率': self.grid_resolution
         }
     
     def _calculate_actual_coverage_area(self) -> float:
         """
-        计算实际覆盖面积（精确几何计算，自动处理重叠）
+        计算实际覆盖面积（在细分网格上积分估算，自动处理重叠）
         
         返回:
             实际覆盖的面积
         """
         if not self.station_locations:
             return 0.0
-            
-        try:
-            # 创建所有观测站的覆盖圆
-            coverage_circles = []
-            for station in self.station_locations:
-                # 创建圆形覆盖区域
-                circle = Point(station).buffer(self.sensor_radius)
-                # 只考虑与目标区域的交集
-                intersection = circle.intersection(self.target_area)
-                if not intersection.is_empty:
-                    coverage_circles.append(intersection)
-            
-            if not coverage_circles:
-                return 0.0
-            
-            # 使用shapely的unary_union自动处理重叠并计算总面积
-            total_coverage = unary_union(coverage_circles)
-            
-            # 返回覆盖面积
-            if hasattr(total_coverage, 'area'):
-                return total_coverage.area
-            else:
-                return 0.0
-                
-        except Exception as e:
-            print(f"警告：几何面积计算出错: {e}")
-            # 如果几何计算失败，回退到网格估算
-            return len(self.covered_points) * (self.grid_resolution ** 2)
+        
+        _, covered_cells, cell_area = self._subgrid_coverage_cells()
+        return covered_cells * cell_area
+    
+    def _subgrid_coverage_cells(self) -> Tuple[np.ndarray, int, float]:
+        """
+        在细分网格上统计各观测站及全部观测站覆盖的目标区域单元数
+        
+        以 grid_resolution / COVERAGE_SUBDIVISION 为边长把目标区域划分为小单元，
+        单元中心落在观测站半径内即视为被该观测站覆盖
+        
+        返回:
+            各观测站覆盖的单元数, 被任一观测站覆盖的单元数, 单元面积
+        """
+        # 目标区域内的细分网格单元中心
+        cell = self.grid_resolution / COVERAGE_SUBDIVISION
+        minx, miny, maxx, maxy = self.target_area.bounds
+        X, Y = np.meshgrid(np.arange(minx + cell / 2, maxx, cell),
+                           np.arange(miny + cell / 2, maxy, cell), indexing='ij')
+        xs, ys = X.ravel(), Y.ravel()
+        inside = contains_xy(self.target_area, xs, ys)
+        xs, ys = xs[inside], ys[inside]
+        
+        # 用单元中心的KD树一次查询各观测站半径内的单元，只访问圆附近的单元，合并为覆盖掩码
+        stations = np.asarray(self.station_locations, dtype=np.float64).reshape(-1, 2)
+        station_cells = np.zeros(len(stations), dtype=np.int64)
+        covered = np.zeros(len(xs), dtype=bool)
+        neighbors = cKDTree(np.column_stack([xs, ys])).query_ball_point(stations, self.sensor_radius)
+        for k, indices in enumerate(neighbors):
+            station_cells[k] = len(indices)
+            covered[indices] = True
+        
+        return station_cells, int(np.count_nonzero(covered)), cell * cell
     
     def get_detailed_coverage_analysis(self) -> dict:
         """
@@ -339,29 +476,23 @@ class MCLPObservationStationSolver:
             return {'error': '没有观测站数据'}
         
         try:
-            # 计算每个观测站的独立覆盖面积
-            individual_areas = []
-            individual_coverage_in_target = []
-            
-            for i, station in enumerate(self.station_locations):
-                circle = Point(station).buffer(self.sensor_radius)
-                # 观测站的总覆盖面积
-                total_circle_area = circle.area
-                individual_areas.append(total_circle_area)
-                
-                # 在目标区域内的覆盖面积
-                intersection = circle.intersection(self.target_area)
-                area_in_target = intersection.area if hasattr(intersection, 'area') else 0.0
-                individual_coverage_in_target.append(area_in_target)
+            # 每个观测站的独立覆盖面积为圆面积的解析值
+            total_circle_area = math.pi * self.sensor_radius ** 2
+            individual_areas = [total_circle_area] * len(self.station_locations)
+            
+            # 单站在目标区域内的覆盖与实际覆盖在同一细分网格上估算，
+            # 重叠面积按单元数相减，单站时恰为 0 且不会为负
+            station_cells, covered_cells, cell_area = self._subgrid_coverage_cells()
+            individual_coverage_in_target = (station_cells * cell_area).tolist()
             
             # 计算总的理论覆盖面积（如果没有重叠）
-            total_theoretical_area = sum(individual_coverage_in_target)
+            total_theoretical_area = int(station_cells.sum()) * cell_area
             
             # 计算实际覆盖面积（处理重叠后）
-            actual_coverage_area = self._calculate_actual_coverage_area()
+            actual_coverage_area = covered_cells * cell_area
             
             # 计算重叠面积
-            overlap_area = total_theoretical_area - actual_coverage_area
+            overlap_area = (int(station_cells.sum()) - covered_cells) * cell_area
             overlap_percentage = (overlap_area / total_theoretical_area * 100) if total_theoretical_area > 0 else 0
             
             return {
@@ -445,8 +576,11 @@ class MCLPObservationStationSolver:
         best_stations = current_stations.copy()
         best_coverage = current_coverage
         
-        # 获取候选位置
-        candidate_positions = self._get_candidate_positions()
+        # 获取候选位置及其覆盖位集，各传感器的覆盖关系预先打包为位集
+        candidate_positions, candidate_bits = self._candidate_coverage()
+        station_bits = self._positions_to_bits(current_stations)
+        total_points = len(self.grid_points)
+        current_count = int(popcount(np.bitwise_or.reduce(station_bits, axis=0)))
         
         optimization_history = []
         no_improvement_count = 0
@@ -456,37 +590,27 @@ class MCLPObservationStationSolver:
             
             # 尝试移动每个传感器到更好的位置
             for station_idx in range(len(current_stations)):
-                best_new_position = None
-                best_new_coverage = current_coverage
-                
                 # 保存当前传感器位置
                 original_position = current_stations[station_idx]
                 
-                # 尝试将当前传感器移动到每个候选位置
-                for new_pos in candidate_positions:
-                    # 临时移动传感器
-                    current_stations[station_idx] = new_pos
-                    
-                    # 评估新布局的覆盖率
-                    new_coverage = self._evaluate_station_layout(current_stations)
-                    
-                    # 如果找到更好的位置
-                    if new_coverage > best_new_coverage:
-                        best_new_coverage = new_coverage
-                        best_new_position = new_pos
+                # 其余传感器的覆盖位集为全部覆盖去掉仅由当前传感器覆盖的位，
+                # 移动到各候选位置后的覆盖点数为其与候选位集并集的置位数
+                union, unique = union_and_unique(station_bits)
+                counts = self._union_counts(union & ~unique[station_idx], candidate_bits)
                 
-                # 如果找到改进
-                if best_new_position is not None:
+                # 取第一个覆盖点数最多且优于当前布局的候选位置
+                best = int(np.argmax(counts)) if len(counts) > 0 else -1
+                if best >= 0 and counts[best] > current_count:
+                    best_new_position = tuple(candidate_positions[best].tolist())
                     current_stations[station_idx] = best_new_position
-                    current_coverage = best_new_coverage
+                    station_bits[station_idx] = candidate_bits[best]
+                    current_count = int(counts[best])
+                    current_coverage = current_count / total_points
                     improved = True
                     
                     print(f"迭代 {iteration+1}: 移动传感器 {station_idx+1} "
                           f"从 {original_position} 到 {best_new_position}, "
                           f"覆盖率: {current_coverage*100:.2f}%")
-                else:
-                    # 恢复原位置
-                    current_stations[station_idx] = original_position
             
             # 记录优化历史
             optimization_history.append({
@@ -553,20 +677,13 @@ class MCLPObservationStationSolver:
         if not stations:
             return 0.0
         
-        # 计算被覆盖的网格点
-        covered_points = set()
+        positions = np.ascontiguousarray(stations, dtype=np.float64).reshape(-1, 2)
+        if NUMBA_AVAILABLE and len(positions) * len(self.grid_points) > NUMBA_MIN_WORK:
+            return _coverage_kernel(self.grid_x, self.grid_y, positions, self.sensor_radius) / len(self.grid_points)
         
-        for station_pos in stations:
-            station_point = Point(station_pos)
-            
-            for i, grid_point in enumerate(self.grid_points):
-                grid_point_geom = Point(grid_point)
-                if station_point.distance(grid_point_geom) <= self.sensor_radius:
-                    covered_points.add(i)
-        
-        # 计算覆盖率
+        # 计算覆盖率，被覆盖点数为布局覆盖位集的置位数
         total_points = len(self.grid_points)
-        coverage_ratio = len(covered_points) / total_points if total_points > 0 else 0.0
+        coverage_ratio = int(popcount(self._layout_bits(positions))) / total_points if total_points > 0 else 0.0
         
         return coverage_ratio
     
@@ -584,31 +701,25 @@ class MCLPObservationStationSolver:
         """
         # 临时保存当前观测站位置
         temp_stations = self.station_locations.copy()
-        temp_covered = self.covered_points.copy()
+        temp_covered = self.covered_mask.copy()
         
         # 评估原始布局
         self.station_locations = original_stations
-        self.covered_points = set()
-        for station_pos in original_stations:
-            covered = self._calculate_coverage_for_position(station_pos)
-            self.covered_points.update(covered)
+        self.covered_mask = self._bits_to_mask(self._layout_bits(original_stations))
         
         original_stats = self.get_coverage_statistics()
         original_detailed = self.get_detailed_coverage_analysis()
         
         # 评估优化后布局
         self.station_locations = optimized_stations
-        self.covered_points = set()
-        for station_pos in optimized_stations:
-            covered = self._calculate_coverage_for_position(station_pos)
-            self.covered_points.update(covered)
+        self.covered_mask = self._bits_to_mask(self._layout_bits(optimized_stations))
             
         optimized_stats = self.get_coverage_statistics()
         optimized_detailed = self.get_detailed_coverage_analysis()
         
         # 恢复原始状态
         self.station_locations = temp_stations
-        self.covered_points = temp_covered
+        self.covered_mask = temp_covered
         
         # 计算改进幅度
         original_coverage = float(original_stats['网格覆盖率'].replace('%', ''))
@@ -618,12 +729,12 @@ class MCLPObservationStationSolver:
         return {
             '原始方案': {
                 '覆盖率': original_stats['网格覆盖率'],
-                '覆盖面积': original_stats['实际覆盖面积(几何)'],
+                '覆盖面积': original_stats['实际覆盖面积(细分网格)'],
                 '重叠比例': original_detailed.get('重叠比例', 'N/A') if 'error' not in original_detailed else 'N/A'
             },
             '优化方案': {
                 '覆盖率': optimized_stats['网格覆盖率'],
-                '覆盖面积': optimized_stats['实际覆盖面积(几何)'],
+                '覆盖面积': optimized_stats['实际覆盖面积(细分网格)'],
                 '重叠比例': optimized_detailed.get('重叠比例', 'N/A') if 'error' not in optimized_detailed else 'N/A'
             },
             '改进效果': {
@@ -687,8 +798,10 @@ class MCLPObservationStationSolver:
         current_stations = optimized_existing.copy()
         current_coverage = coverage_after_position_opt
         
-        # 获取候选位置
-        candidate_positions = self._get_candidate_positions()
+        # 获取候选位置及其覆盖位集，当前布局的覆盖位集随新增传感器增量更新
+        candidate_positions, candidate_bits = self._candidate_coverage()
+        covered_bits = self._layout_bits(current_stations)
+        total_points = len(self.grid_points)
         
         added_stations = []
         optimization_history = []
@@ -701,20 +814,20 @@ class MCLPObservationStationSolver:
             best_position = None
             best_new_coverage = current_coverage
             
-            # 尝试每个候选位置
-            for candidate_pos in candidate_positions:
-                # 避免与现有传感器位置重复
-                if self._is_too_close_to_existing(candidate_pos, current_stations):
-                    continue
-                
-                # 临时添加候选传感器
-                temp_stations = current_stations + [candidate_pos]
-                temp_coverage = self._evaluate_station_layout(temp_stations)
-                
-                # 如果找到更好的位置
-                if temp_coverage > best_new_coverage:
-                    best_new_coverage = temp_coverage
-                    best_position = candidate_pos
+            # 一次排除与现有传感器太近的候选位置，避免位置重复；
+            # 覆盖范围够不到任何未覆盖网格点的候选位置不可能提高覆盖率，同样跳过
+            usable = ~self._too_close_mask(candidate_positions, current_stations)
+            usable &= self._near_uncovered(candidate_positions, self._bits_to_mask(covered_bits))
+            usable = np.flatnonzero(usable)
+            
+            # 一次评估添加各候选位置后的覆盖点数，取第一个覆盖率最高且有提升的位置
+            counts = self._union_counts(covered_bits, candidate_bits[usable])
+            if len(counts) > 0:
+                best = int(np.argmax(counts))
+                if counts[best] / total_points > best_new_coverage:
+                    best_new_coverage = counts[best] / total_points
+                    best_position = tuple(candidate_positions[usable[best]].tolist())
+                    covered_bits |= candidate_bits[usable[best]]
             
             # 如果找到改进的位置
             if best_position is not None:
@@ -791,17 +904,37 @@ class MCLPObservationStationSolver:
         返回:
             如果太近返回True，否则返回False
         """
+        return bool(self._too_close_mask([candidate_pos], existing_stations, min_distance)[0])
+    
+    def _too_close_mask(self, positions, existing_stations: List[Tuple[float, float]], 
+                        min_distance: float = None) -> np.ndarray:
+        """
+        批量检查各候选位置是否与现有传感器太近，返回长度为候选数的布尔数组
+        """
         if min_distance is None:
             min_distance = self.sensor_radius * 0.5  # 默认为观测半径的一半
         
-        candidate_point = Point(candidate_pos)
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        existing = np.asarray(existing_stations, dtype=np.float64).reshape(-1, 2)
         
-        for station_pos in existing_stations:
-            station_point = Point(station_pos)
-            if candidate_point.distance(station_point) < min_distance:
-                return True
+        # 广播计算 (候选数, 传感器数) 的距离矩阵
+        distance = point_distance(positions[:, 0, None], positions[:, 1, None], existing[:, 0], existing[:, 1])
+        return (distance < min_distance).any(axis=1)
+    
+    def _near_uncovered(self, positions: np.ndarray, covered: np.ndarray) -> np.ndarray:
+        """
+        筛选覆盖圆的外包矩形与未覆盖网格点外包矩形相交的候选位置
         
-        return False
+        其余候选位置覆盖不到任何未覆盖网格点；外包矩形按略放大的半径计算，不会误删边界上的候选
+        """
+        uncovered = self.grid_points[~covered]
+        if len(uncovered) == 0:
+            return np.zeros(len(positions), dtype=bool)
+        
+        reach = self.sensor_radius * (1 + KDTREE_RADIUS_SLACK)
+        lower = uncovered.min(axis=0) - reach
+        upper = uncovered.max(axis=0) + reach
+        return ((positions >= lower) & (positions <= upper)).all(axis=1)
     
     def smart_station_optimization(self, existing_stations: List[Tuple[float, float]], 
                                  target_coverage_ratio: float,
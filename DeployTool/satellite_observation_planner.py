@@ -27,19 +27,118 @@ from satelliteTool.find_Satellite import get_valid_satellite_tle_as_dict
 功能: 根据指定的观测区域、卫星数据和时间范围，规划最优的卫星覆盖方案。
 """
 
+import hashlib
 import json
 from datetime import datetime
+from functools import partial
 from itertools import combinations
+import multiprocessing
 import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
 from shapely.geometry import shape, mapping
 from shapely.ops import unary_union, transform
+from shapely.prepared import prep
 from pyproj import Proj, Transformer
 import folium
 
 from satelliteTool.get_observation_lace import get_coverage_lace
 from satelliteTool.get_observation_overlap import get_observation_overlap
 
+# 组合方案最多包含的卫星数
+MAX_COMBINATION_SIZE = 5
+# 组合剪枝上界的相对余量：先合并再投影的面积并不严格满足次可加性，留出余量避免误剪
+COVERAGE_BOUND_SLACK = 1e-6
+
+try:
+	from shapely import STRtree, transform as _transform_coords
+
+	def project_geometry(transformer, geom):
+		"""一次调用 pyproj 投影几何体的全部坐标"""
+		return _transform_coords(geom, lambda xy: np.column_stack(transformer.transform(xy[:, 0], xy[:, 1])))
+
+	def intersecting_indices(target, geoms):
+		"""用批量构建的 STR 树一次查询与目标相交的几何体序号"""
+		return STRtree(geoms).query(target, predicate='intersects')
+except ImportError:  # shapely < 2.0
+	def project_geometry(transformer, geom):
+		return transform(transformer.transform, geom)
+
+	def intersecting_indices(target, geoms):
+		prepared = prep(target)
+		return [i for i, geom in enumerate(geoms) if prepared.intersects(geom)]
+
+
+def valid_geometries(features):
+	"""解析 GeoJSON 要素中的几何体，用 buffer(0) 修复无效几何体并去掉空几何体"""
+	geoms = []
+	for feature in features:
+		geom_json = feature.get('geometry')
+		if geom_json:
+			geom = shape(geom_json)
+			if not geom.is_valid: geom = geom.buffer(0)
+			if geom.is_valid and not geom.is_empty: geoms.append(geom)
+	return geoms
+
+
+def cached_call(func, cache_dir, **kwargs):
+	"""
+	以函数名与参数 (TLE、时间窗口、视场角、采样间隔等) 的哈希为键，把 func(**kwargs) 的结果缓存为
+	cache_dir 下的 pickle 文件，相同参数的再次规划直接读取，不再重复轨道传播与足迹求交
+	"""
+	signature = json.dumps(kwargs, sort_keys=True, default=str)
+	key = hashlib.sha1(f"{func.__module__}.{func.__name__}:{signature}".encode()).hexdigest()
+	path = os.path.join(cache_dir, f"{func.__name__}_{key}.pkl")
+	if os.path.exists(path):
+		with open(path, 'rb') as f:
+			return pickle.load(f)
+	result = func(**kwargs)
+	os.makedirs(cache_dir, exist_ok=True)
+	# 先写临时文件再替换，并行进程或中断时不会留下不完整的缓存
+	tmp_path = f"{path}.{os.getpid()}.tmp"
+	with open(tmp_path, 'wb') as f:
+		pickle.dump(result, f)
+	os.replace(tmp_path, path)
+	return result
+
+
+def map_satellites(func, tle_dict, n_jobs=None, **kwargs):
+	"""
+	按卫星拆分 tle_dict 分别调用 func(tle_dict=..., **kwargs)，按 tle_dict 的顺序合并返回的字典。
+	各卫星的轨道传播与足迹求交相互独立，多颗卫星时在进程池中并行；n_jobs 为 None 表示使用全部 CPU 核心
+	"""
+	tasks = [{name: tle} for name, tle in tle_dict.items()]
+	n_jobs = min(n_jobs or os.cpu_count() or 1, len(tasks))
+	if n_jobs > 1:
+		with ProcessPoolExecutor(max_workers=n_jobs, mp_context=multiprocessing.get_context('spawn')) as executor:
+			futures = [executor.submit(func, tle_dict=task, **kwargs) for task in tasks]
+			results = [future.result() for future in futures]
+	else:
+		results = [func(tle_dict=task, **kwargs) for task in tasks]
+	merged = {}
+	for result in results:
+		merged.update(result)
+	return merged
+
+
+def greedy_cover(proj_unions, required_area, max_size=MAX_COMBINATION_SIZE):
+	"""
+	贪心最大覆盖：每轮加入新增覆盖面积最大的卫星，直到覆盖面积达到 required_area。
+	max_size 颗以内无法达到时返回 None。
+	"""
+	remaining = dict(proj_unions)
+	picked, covered = [], None
+	while remaining and len(picked) < max_size:
+		gains = {s: (u.area if covered is None else u.difference(covered).area) for s, u in remaining.items()}
+		best = max(gains, key=gains.get)
+		if gains[best] <= 0: break
+		picked.append(best)
+		covered = remaining.pop(best) if covered is None else covered.union(remaining.pop(best))
+		if covered.area >= required_area: return picked
+	return None
+
 
 def plan_satellite_observation(
 		target_geojson_path,
@@ -49,11 +148,15 @@ def plan_satellite_observation(
 		target_coverage=0.9,
 		fov=20.0,
 		interval_seconds=600,
-		output_dir="planning_results"
+		output_dir="planning_results",
+		n_jobs=None,
+		cache_dir=None
 ):
 	"""
 	一个通用的卫星观测规划函数 (v2)。
 	如果找不到满足目标的方案，会返回一个由所有相交卫星组成的'尽力而为'方案。
+	n_jobs 为逐卫星计算足迹与覆盖率的并行进程数，None 表示使用全部 CPU 核心，1 表示在当前进程中依次计算。
+	cache_dir 不为 None 时，逐卫星的足迹与覆盖率结果缓存在该目录下，相同卫星与时间窗口的重复规划直接复用。
 	"""
 	# ... (步骤 0 到 3 的代码保持不变) ...
 	print("=" * 60)
@@ -74,11 +177,16 @@ def plan_satellite_observation(
 		print(f"❌ 加载观测区域GeoJSON失败: {e}")
 		return {'success': False, 'message': 'Failed to load target GeoJSON.'}
 
+	lace_func, overlap_func = get_coverage_lace, get_observation_overlap
+	if cache_dir is not None:
+		lace_func = partial(cached_call, get_coverage_lace, cache_dir)
+		overlap_func = partial(cached_call, get_observation_overlap, cache_dir)
+
 	# --- 步骤 1: 获取所有卫星的覆盖足迹 (粗筛) ---
 	print(f"\n[1/5] 正在获取卫星覆盖足迹 (时间: {start_time} 到 {end_time})...")
 	try:
-		coverage_dict = get_coverage_lace(
-			tle_dict=tle_dict, start_time_str=start_time, end_time_str=end_time,
+		coverage_dict = map_satellites(
+			lace_func, tle_dict, n_jobs, start_time_str=start_time, end_time_str=end_time,
 			fov=fov, interval_seconds=interval_seconds
 		)
 		total_features = sum(len(geojson.get('features', [])) for geojson in coverage_dict.values())
@@ -90,29 +198,20 @@ def plan_satellite_observation(
 	# --- 步骤 2: 筛选与观测区域相交的卫星 ---
 	print("\n[2/5] 正在筛选与观测区域相交的卫星...")
 	try:
-		valid_target_geoms = []
-		for feature in target_geojson.get('features', []):
-			geom_json = feature.get('geometry')
-			if geom_json:
-				geom = shape(geom_json)
-				if not geom.is_valid: geom = geom.buffer(0)
-				if geom.is_valid and not geom.is_empty: valid_target_geoms.append(geom)
+		valid_target_geoms = valid_geometries(target_geojson.get('features', []))
 		if not valid_target_geoms: raise ValueError("目标GeoJSON中没有有效的几何对象")
 		target_shape = unary_union(valid_target_geoms)
 
-		intersecting_satellites = []
+		# 卫星覆盖与目标相交当且仅当其某个足迹与目标相交：汇总所有卫星的有效足迹，
+		# 一次空间索引查询找出相交足迹，无需合并各卫星的足迹
+		footprint_geoms = []
+		footprint_owners = []
 		for satellite_name, satellite_geojson in coverage_dict.items():
-			valid_sat_geoms = []
-			for feature in satellite_geojson.get('features', []):
-				geom_json = feature.get('geometry')
-				if geom_json:
-					geom = shape(geom_json)
-					if not geom.is_valid: geom = geom.buffer(0)
-					if geom.is_valid and not geom.is_empty: valid_sat_geoms.append(geom)
-			if not valid_sat_geoms: continue
-			satellite_shape = unary_union(valid_sat_geoms)
-			if target_shape.intersects(satellite_shape):
-				intersecting_satellites.append(satellite_name)
+			geoms = valid_geometries(satellite_geojson.get('features', []))
+			footprint_geoms.extend(geoms)
+			footprint_owners.extend([satellite_name] * len(geoms))
+		hit_satellites = {footprint_owners[i] for i in intersecting_indices(target_shape, footprint_geoms)}
+		intersecting_satellites = [name for name in coverage_dict if name in hit_satellites]
 
 		print(f"✅ 筛选完成，找到 {len(intersecting_satellites)} 颗相交卫星: {intersecting_satellites}")
 		if not intersecting_satellites:
@@ -127,8 +226,8 @@ def plan_satellite_observation(
 	print(f"\n[3/5] 正在精确计算卫星覆盖率...")
 	filtered_tle_dict = {name: tle_dict[name] for name in intersecting_satellites}
 	try:
-		coverage_results = get_observation_overlap(
-			tle_dict=filtered_tle_dict, start_time_str=start_time, end_time_str=end_time,
+		coverage_results = map_satellites(
+			overlap_func, filtered_tle_dict, n_jobs, start_time_str=start_time, end_time_str=end_time,
 			target_geojson=target_geojson, fov=fov, interval_seconds=interval_seconds
 		)
 		print(f"✅ 覆盖率计算完成:")
@@ -143,7 +242,25 @@ def plan_satellite_observation(
 	wgs84_proj = Proj('epsg:4326')
 	equal_area_proj = Proj('+proj=moll')
 	transformer = Transformer.from_proj(wgs84_proj, equal_area_proj, always_xy=True)
-	target_area = transform(transformer.transform, target_shape).area
+	target_area = project_geometry(transformer, target_shape).area
+
+	# 每颗卫星的交集足迹只解析、校验一次。判定和报告的覆盖率以及最终交集都由方案内全部原始足迹合并得到，
+	# 先合并各卫星的并集再合并会使投影面积略有不同，可能改变方案；各卫星的并集只用于剪枝上界与贪心。
+	# 合并仍在经纬度下进行后再投影：投影后边不再是直线，先投影再合并会使交点位置和覆盖率略有不同
+	sat_footprints = {}
+	for satellite, data in coverage_results.items():
+		valid_footprints = valid_geometries(data['intersection_footprints'])
+		if valid_footprints:
+			sat_footprints[satellite] = valid_footprints
+	sat_unions = {s: unary_union(footprints) for s, footprints in sat_footprints.items()}
+	# 各卫星覆盖的投影面积之和是组合覆盖面积的上界，上界不足目标的组合无需合并
+	sat_proj_areas = {s: project_geometry(transformer, u).area for s, u in sat_unions.items()}
+	required_area = target_coverage * target_area / (1 + COVERAGE_BOUND_SLACK)
+
+	def merged_footprints(sats):
+		"""按卫星顺序合并给定卫星的全部原始足迹，没有足迹时返回 None"""
+		footprints = [fp for s in sats for fp in sat_footprints.get(s, ())]
+		return unary_union(footprints) if footprints else None
 
 	optimal_plan = None
 	best_effort_plan = None
@@ -158,46 +275,48 @@ def plan_satellite_observation(
 	if not optimal_plan:
 		sorted_satellites = sorted(coverage_results.keys(), key=lambda s: coverage_results[s]['coverage_ratio'],
 		                           reverse=True)
-		for combo_size in range(2, min(6, len(sorted_satellites) + 1)):
+
+		def combo_coverage_of(combo):
+			merged = merged_footprints(combo)
+			return project_geometry(transformer, merged).area / target_area if merged is not None else 0.0
+
+		# 先用贪心最大覆盖得到一个可行组合，穷举只需在比它更小的组合规模中寻找
+		greedy_plan = None
+		greedy_sats = greedy_cover({s: project_geometry(transformer, sat_unions[s]) for s in sorted_satellites
+		                            if s in sat_unions}, required_area)
+		if greedy_sats:
+			greedy_coverage = combo_coverage_of(greedy_sats)
+			if greedy_coverage >= target_coverage:
+				greedy_plan = {'type': 'combination', 'satellites': greedy_sats, 'coverage': greedy_coverage}
+		max_size = len(greedy_plan['satellites']) - 1 if greedy_plan else MAX_COMBINATION_SIZE
+
+		for combo_size in range(2, min(max_size, len(sorted_satellites)) + 1):
 			for combo in combinations(sorted_satellites, combo_size):
-				# ... (组合计算逻辑与之前版本相同) ...
-				footprints = [shape(f['geometry']) for s in combo for f in
-				              coverage_results[s]['intersection_footprints'] if f.get('geometry')]
-				if not footprints: continue
-				valid_footprints = [fp.buffer(0) if not fp.is_valid else fp for fp in footprints]
-				valid_footprints = [fp for fp in valid_footprints if fp.is_valid and not fp.is_empty]
-				if not valid_footprints: continue
-				merged_footprints = unary_union(valid_footprints)
-				projected_merged = transform(transformer.transform, merged_footprints)
-				combo_coverage = projected_merged.area / target_area
+				if sum(sat_proj_areas.get(s, 0.0) for s in combo) < required_area: continue
+				combo_coverage = combo_coverage_of(combo)
 				if combo_coverage >= target_coverage:
 					optimal_plan = {'type': 'combination', 'satellites': list(combo), 'coverage': combo_coverage}
-					print(f"✅ 找到最佳组合方案: {list(combo)} (覆盖率: {combo_coverage:.2%})")
 					break
 			if optimal_plan: break
+		optimal_plan = optimal_plan or greedy_plan
+		if optimal_plan:
+			print(f"✅ 找到最佳组合方案: {optimal_plan['satellites']} (覆盖率: {optimal_plan['coverage']:.2%})")
 
 	# --- START of MODIFICATION ---
 	# 如果没有找到最优方案，则计算一个“尽力而为”的最佳方案
 	if not optimal_plan:
 		print("   未能找到满足目标的方案，正在计算'尽力而为'的最佳方案...")
 		all_sats = list(coverage_results.keys())
-		all_footprints = [shape(f['geometry']) for s in all_sats for f in coverage_results[s]['intersection_footprints']
-		                  if f.get('geometry')]
-
-		if all_footprints:
-			valid_footprints = [fp.buffer(0) if not fp.is_valid else fp for fp in all_footprints]
-			valid_footprints = [fp for fp in valid_footprints if fp.is_valid and not fp.is_empty]
-
-			if valid_footprints:
-				merged_all = unary_union(valid_footprints)
-				projected_all = transform(transformer.transform, merged_all)
-				best_effort_coverage = projected_all.area / target_area
-				best_effort_plan = {
-					'type': 'best_effort_combination',
-					'satellites': all_sats,
-					'coverage': best_effort_coverage
-				}
-				print(f"   ✅ '尽力而为'方案计算完成，合并所有卫星可达覆盖率: {best_effort_coverage:.2%}")
+
+		if sat_footprints:
+			projected_all = project_geometry(transformer, merged_footprints(all_sats))
+			best_effort_coverage = projected_all.area / target_area
+			best_effort_plan = {
+				'type': 'best_effort_combination',
+				'satellites': all_sats,
+				'coverage': best_effort_coverage
+			}
+			print(f"   ✅ '尽力而为'方案计算完成，合并所有卫星可达覆盖率: {best_effort_coverage:.2%}")
 
 	# --- END of MODIFICATION ---
 
@@ -245,20 +364,15 @@ def plan_satellite_observation(
 	intersection_geojson = {"type": "FeatureCollection", "features": []}
 	if plan_to_use:
 		sats_in_plan = plan_to_use['satellites']
-		final_footprints_geom = [shape(f['geometry']) for s in sats_in_plan for f in
-		                         coverage_results[s]['intersection_footprints'] if f.get('geometry')]
-		if final_footprints_geom:
-			valid_final_footprints = [fp.buffer(0) if not fp.is_valid else fp for fp in final_footprints_geom]
-			valid_final_footprints = [fp for fp in valid_final_footprints if fp.is_valid and not fp.is_empty]
-			if valid_final_footprints:
-				final_union = unary_union(valid_final_footprints)
-				final_intersection = final_union.intersection(target_shape)
-				feature = {
-					"type": "Feature",
-					"geometry": mapping(final_intersection),
-					"properties": {"satellites": sats_in_plan, "estimated_coverage": plan_to_use['coverage']}
-				}
-				intersection_geojson['features'].append(feature)
+		final_union = merged_footprints(sats_in_plan)
+		if final_union is not None:
+			final_intersection = final_union.intersection(target_shape)
+			feature = {
+				"type": "Feature",
+				"geometry": mapping(final_intersection),
+				"properties": {"satellites": sats_in_plan, "estimated_coverage": plan_to_use['coverage']}
+			}
+			intersection_geojson['features'].append(feature)
 	intersection_path = os.path.join(output_dir, f"{area_name}_final_intersection.geojson")
 	with open(intersection_path, 'w', encoding='utf-8') as f:
 		json.dump(intersection_geojson, f, ensure_ascii=False, indent=2)